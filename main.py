@@ -14,10 +14,6 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from sierra_agent import SierraAgent, Branding
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
@@ -162,8 +158,9 @@ def main():
             
             # Process user input through the AI agent
             print("\n🏔️ Sierra Adventure Agent: ", end="", flush=True)
-            response = agent.process_user_input(user_input)
-            print(response)
+            for chunk in agent.process_user_input_stream(user_input):
+                print(chunk, end="", flush=True)
+            print()
             
         except KeyboardInterrupt:
             print("\n\n👋 Goodbye! Thanks for using Sierra Outfitters Adventure Agent! Happy trails! 🏔️")
@@ -197,4 +194,8 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     main()
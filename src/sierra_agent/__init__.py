@@ -5,9 +5,14 @@ AI-powered customer service agent for Sierra Outfitters with real-time
 quality monitoring, comprehensive analytics, and intelligent planning.
 """
 
+import logging
+
 from .core.agent import AgentConfig, SierraAgent
 from .utils.branding import Branding
 
+# Library logging stays silent unless the application configures handlers
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 __version__ = "2.0.0"
 __all__ = [
     "AgentConfig",
@@ -6,9 +6,11 @@ consolidating the scattered context assembly logic into a clean, maintainable sy
 """
 
 import logging
+import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from sierra_agent.data.data_types import (
     Order,
@@ -21,6 +23,34 @@ from sierra_agent.ai.prompt_types import Prompt
 
 logger = logging.getLogger(__name__)
 
+# Substrings marking a dict result key as an identifier worth keeping,
+# matched case-insensitively in one scan of the key
+_IDENTIFIER_KEY_PARTS = re.compile("id|number|code|name|email|sku", re.IGNORECASE)
+
+# Hardcoded tool descriptions for prompts (tool orchestrator integration removed)
+_TOOL_DESCRIPTIONS = MappingProxyType({
+    "get_order_status": "Look up order information by order number and email",
+    "browse_catalog": "Browse and search Sierra Outfitters product catalog",
+    "get_product_info": "Get detailed information for specific products by SKU or name",
+    "get_recommendations": "Get personalized product recommendations based on customer context",
+    "get_early_risers_promotion": "Check for available promotions and discounts",
+    "get_company_info": "Get general company information",
+    # "get_contact_info": "Get contact information for customer service",  # COMMENTED OUT - Not needed for assignment
+    # "get_policies": "Get information about company policies"  # COMMENTED OUT - Not needed for assignment
+})
+# Prompt line per known tool, formatted once
+_TOOL_LINES = MappingProxyType({name: f"- {name}: {desc}" for name, desc in _TOOL_DESCRIPTIONS.items()})
+
+# Result data kinds preferred over generic dicts when picking the primary result
+_BUSINESS_DATA_KINDS = frozenset({"order", "product", "product_list", "promotion"})
+
+# Summary lines for the available-data entries that have one, with the value
+# type they expect; other entries are summarized by their type name
+_AVAILABLE_DATA_LINES: Dict[str, Tuple[type, Callable[[Any], str]]] = {
+    "current_order": (Order, lambda order: f"- Current Order: {order.order_number} for {order.customer_name}"),
+    "recent_products": (list, lambda products: f"- Recent Products: {len(products)} products found"),
+}
+
 class ContextType(Enum):
     """Types of LLM contexts we support."""
     CUSTOMER_SERVICE = "customer_service"  # Main customer response generation
@@ -200,7 +230,7 @@ class ContextBuilder:
             # Handle dictionary results - extract any identifiers
             summary = "Retrieved information"
             for key, value in tool_result.data.items():
-                if any(id_key in key.lower() for id_key in ["id", "number", "code", "name", "email", "sku"]):
+                if _IDENTIFIER_KEY_PARTS.search(key):
                     identifiers[key] = str(value)
             interaction_type = "data_lookup"
 
@@ -223,15 +253,9 @@ class ContextBuilder:
                 return result
 
         # Prioritize business objects over generic dicts
-        business_object_types = (Order, Product, Promotion)
-
         for result in tool_results:
-            if result.success and result.data:
-                if isinstance(result.data, business_object_types):
-                    return result
-                if isinstance(result.data, list) and result.data:
-                    if isinstance(result.data[0], business_object_types):
-                        return result
+            if result.success and result.data_kind in _BUSINESS_DATA_KINDS:
+                return result
 
         # Fall back to last successful result
         for result in reversed(tool_results):
@@ -244,8 +268,11 @@ class ContextBuilder:
 class LLMPromptBuilder:
     """Builds LLM prompts from strongly-typed contexts."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize prompt builder."""
+        # Last conversation summary with the context and version it describes;
+        # the context is often unchanged between consecutive responses
+        self._summary_cache: Optional[Tuple[Any, int, str]] = None
 
     def build_customer_service_prompt(self, context: CustomerServiceContext) -> str:
         """Build customer service prompt from context."""
@@ -380,7 +407,16 @@ Respond with ONLY a JSON array of tool names for the next steps:
         """Generate a simple formatted conversation summary for the prompt."""
         if not plan_context:
             return ""
-        
+
+        cached = self._summary_cache
+        if cached is not None and cached[0] is plan_context and cached[1] == plan_context.version:
+            return cached[2]
+        summary = self._build_conversation_summary(plan_context)
+        self._summary_cache = (plan_context, plan_context.version, summary)
+        return summary
+
+    def _build_conversation_summary(self, plan_context) -> str:
+        """Build the conversation summary from the context's business data."""
         # Use the new ConversationContext unified system
         available_data = plan_context.to_available_data()
         if not available_data:
@@ -398,7 +434,7 @@ Respond with ONLY a JSON array of tool names for the next steps:
         if "recent_products" in available_data:
             products = available_data["recent_products"]
             if products:
-                product_names = [p.product_name for p in products[:2] if hasattr(p, "product_name")]
+                product_names = [p.product_name for p in products[:2]]
                 summary_parts.append("Previous: User searched for products")
                 summary_parts.append(f"Response: Found products including {', '.join(product_names)}")
 
@@ -416,7 +452,8 @@ Respond with ONLY a JSON array of tool names for the next steps:
             if primary_result.success:
                 # Use the excellent existing serialization
                 context_data = primary_result.serialize_for_context()
-                print(f"📄 LLM CONTEXT DATA:\n{context_data}\n")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("LLM context data:\n%s", context_data)
                 return context_data
             # Handle failed primary result
             error_msg = primary_result.error if primary_result.error else "Operation failed"
@@ -441,10 +478,9 @@ Respond with ONLY a JSON array of tool names for the next steps:
 
         formatted = []
         for key, value in available_data.items():
-            if key == "current_order" and hasattr(value, "order_number"):
-                formatted.append(f"- Current Order: {value.order_number} for {value.customer_name}")
-            elif key == "recent_products" and isinstance(value, list):
-                formatted.append(f"- Recent Products: {len(value)} products found")
+            line = _AVAILABLE_DATA_LINES.get(key)
+            if line and isinstance(value, line[0]):
+                formatted.append(line[1](value))
             else:
                 formatted.append(f"- {key}: {type(value).__name__} data available")
 
@@ -455,24 +491,9 @@ Respond with ONLY a JSON array of tool names for the next steps:
         if not tools:
             return "No tools available."
 
-        # Use hardcoded descriptions (tool orchestrator integration removed)
-        tool_descriptions = {
-            "get_order_status": "Look up order information by order number and email",
-            "browse_catalog": "Browse and search Sierra Outfitters product catalog",
-            "get_product_info": "Get detailed information for specific products by SKU or name",
-            "get_recommendations": "Get personalized product recommendations based on customer context",
-            "get_early_risers_promotion": "Check for available promotions and discounts",
-            "get_company_info": "Get general company information",
-            # "get_contact_info": "Get contact information for customer service",  # COMMENTED OUT - Not needed for assignment
-            # "get_policies": "Get information about company policies"  # COMMENTED OUT - Not needed for assignment
-        }
-
-        formatted = []
-        for tool in tools:
-            description = tool_descriptions.get(tool, "Available business tool")
-            formatted.append(f"- {tool}: {description}")
-
-        return "\n".join(formatted)
+        return "\n".join(
+            _TOOL_LINES.get(tool) or f"- {tool}: Available business tool" for tool in tools
+        )
 
     def _format_execution_results(self, results: List[ToolResult]) -> str:
         """Format execution results for plan update context."""
@@ -7,7 +7,8 @@ classification, sentiment analysis, and response generation with usage tracking.
 
 import logging
 import os
-from typing import Optional, Dict, List, Union
+from functools import lru_cache
+from typing import Iterator, List, Optional
 
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -16,12 +17,29 @@ from .prompt_types import Prompt
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=None)
+def _shared_openai_client(api_key: str) -> OpenAI:
+    """Get the OpenAI client for an API key, shared by every LLMClient.
+
+    Each client owns an HTTP connection pool, so sharing one keeps TLS
+    connections warm across the thinking and low-latency models.
+    """
+    return OpenAI(api_key=api_key)
+
+
 class LLMClient:
     """Pure OpenAI API client - handles only API communication."""
 
-    def __init__(self, model_name: str = "gpt-4o", max_tokens: int = 1000) -> None:
+    def __init__(
+        self,
+        model_name: str = "gpt-4o",
+        max_tokens: int = 1000,
+        embedding_model: str = "text-embedding-3-small",
+    ) -> None:
         self.model_name = model_name
         self.max_tokens = max_tokens
+        self.embedding_model = embedding_model
 
         # Get API key from environment
         self.api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
@@ -29,14 +47,14 @@ class LLMClient:
 
         if self.api_key:
             try:
-                self.client = OpenAI(api_key=self.api_key)
+                self.client = _shared_openai_client(self.api_key)
             except ImportError:
                 self.api_key = None
                 self.client = None
         else:
             self.client = None
 
-        logger.info(f"LLMClient initialized with model {model_name}")
+        logger.info("LLMClient initialized with model %s", model_name)
 
     def call_llm(self, prompt: Prompt) -> str:
         """Make a direct API call to OpenAI - pure interface."""
@@ -95,5 +113,58 @@ class LLMClient:
             return content.strip()
 
         except Exception as e:
-            logger.exception(f"OpenAI API error: {e}")
+            logger.exception("OpenAI API error: %s", e)
+            raise
+
+    def stream_llm(self, prompt: Prompt) -> Iterator[str]:
+        """Stream response text from OpenAI as it is generated."""
+        if not self.api_key:
+            msg = "OpenAI API key is required"
+            raise ValueError(msg)
+
+        if not self.client:
+            msg = "OpenAI client not initialized"
+            raise ValueError(msg)
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=prompt.to_messages(),
+                max_tokens=self.max_tokens,
+                temperature=prompt.temperature,
+                stream=True
+            )
+
+            # Closing releases the connection when the caller stops reading early
+            with stream:
+                started = False
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if not text:
+                        continue
+                    if not started:
+                        # Match call_llm, which strips leading whitespace
+                        text = text.lstrip()
+                        if not text:
+                            continue
+                        started = True
+                    yield text
+
+        except Exception as e:
+            logger.exception("OpenAI API streaming error: %s", e)
             raise
+
+    def embed(self, text: str) -> List[float]:
+        """Get the embedding vector for a piece of text."""
+        if not self.api_key:
+            msg = "OpenAI API key is required"
+            raise ValueError(msg)
+
+        if not self.client:
+            msg = "OpenAI client not initialized"
+            raise ValueError(msg)
+
+        response = self.client.embeddings.create(model=self.embedding_model, input=text)
+        return response.data[0].embedding
@@ -5,18 +5,28 @@ This module provides a unified, strongly-typed interface for all LLM interaction
 replacing the scattered LLM calls throughout the codebase with a clean service layer.
 """
 
+import hashlib
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import os
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from sierra_agent.utils.json_utils import loads
 
 from .context_builder import (
     ContextBuilder,
     LLMPromptBuilder,
 )
 from .llm_client import LLMClient
+from .prompt_types import Prompt
+from .semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Appended to a streamed reply that broke off partway, so neither the customer
+# nor the conversation record takes it for a complete answer
+INTERRUPTED_REPLY_NOTICE = "\n\n(Sorry, my reply was cut off. Please ask again if you need the rest.)"
+
 class LLMService:
     """Consolidated LLM service with unified context handling."""
 
@@ -26,6 +36,16 @@ class LLMService:
         self.prompt_builder = LLMPromptBuilder()
         self.thinking_client = LLMClient(model_name=thinking_model, max_tokens=2000)
         self.low_latency_client = LLMClient(model_name=low_latency_model, max_tokens=1000)
+        # Both clients share the API key, so one check covers them
+        self.is_available = self.low_latency_client.client is not None
+        # Planning suggestions for paraphrased requests in the same context,
+        # persisted when SEMANTIC_CACHE_PATH names a SQLite file
+        self.planning_cache = SemanticCache(
+            self.low_latency_client.embed, db_path=os.getenv("SEMANTIC_CACHE_PATH")
+        )
+        # Replies to greetings, thanks and similar small talk, which repeat
+        # across sessions; partitioned by the full instructions they answer
+        self.reply_cache = SemanticCache(self.low_latency_client.embed)
 
         logger.info("LLMService initialized with unified context system")
 
@@ -38,25 +58,54 @@ class LLMService:
     ) -> str:
         """Generate customer service response using unified context system."""
         try:
-            context = self.context_builder.build_customer_service_context(
-                user_input=user_input,
-                tool_results=tool_results or [],
-                plan_context=plan_context
-            )
-
-            prompt_str = self.prompt_builder.build_customer_service_prompt(context)
-            from sierra_agent.ai.prompt_types import Prompt
-            # Put the customer request in the user message, not system prompt
-            user_message = f"Customer says: \"{user_input}\""
-            prompt = Prompt(system_prompt=prompt_str, user_message=user_message, temperature=0.7)
+            prompt = self._build_customer_service_prompt(user_input, tool_results, plan_context)
             client = self.thinking_client if use_thinking_model else self.low_latency_client
             
             return client.call_llm(prompt)
 
         except Exception as e:
-            logger.exception(f"Error generating customer service response: {e}")
+            logger.exception("Error generating customer service response: %s", e)
             return self._get_fallback_customer_service_response(user_input)
 
+    def stream_customer_service_response(
+        self,
+        user_input: str,
+        tool_results: Optional[List] = None,
+        plan_context=None,
+        use_thinking_model: bool = False
+    ) -> Iterator[str]:
+        """Stream a customer service response chunk by chunk as the model decodes it."""
+        yielded = False
+        try:
+            prompt = self._build_customer_service_prompt(user_input, tool_results, plan_context)
+            client = self.thinking_client if use_thinking_model else self.low_latency_client
+
+            for chunk in client.stream_llm(prompt):
+                yielded = True
+                yield chunk
+
+        except Exception as e:
+            logger.exception("Error streaming customer service response: %s", e)
+            # A partial reply is marked as cut off rather than passed off as
+            # complete; the fallback only replaces a reply that never started
+            if yielded:
+                yield INTERRUPTED_REPLY_NOTICE
+            else:
+                yield self._get_fallback_customer_service_response(user_input)
+
+    def _build_customer_service_prompt(self, user_input: str, tool_results: Optional[List], plan_context) -> Prompt:
+        """Build the customer service prompt shared by the blocking and streaming paths."""
+        context = self.context_builder.build_customer_service_context(
+            user_input=user_input,
+            tool_results=tool_results or [],
+            plan_context=plan_context
+        )
+
+        prompt_str = self.prompt_builder.build_customer_service_prompt(context)
+        # Put the customer request in the user message, not system prompt
+        user_message = f"Customer says: \"{user_input}\""
+        return Prompt(system_prompt=prompt_str, user_message=user_message, temperature=0.7)
+
     def _get_fallback_customer_service_response(self, user_input: str) -> str:
         """Generate fallback response when LLM fails."""
         return """I'm experiencing some technical difficulties right now, but I'm here to help!
@@ -74,7 +123,31 @@ Thank you for your patience!
         return []
 
     def analyze_vague_request_and_suggest(self, user_input: str, plan_context, available_tools: Optional[List[str]] = None, tool_orchestrator=None) -> List[str]:
-        """Use LLM to analyze requests and suggest the right sequence of actions."""
+        """Use LLM to analyze requests and suggest the right sequence of actions.
+
+        Suggestions are cached by request similarity, keyed on the tools and
+        the kinds of context data available, since those shape the plan.
+        """
+        tools = tool_orchestrator.get_available_tools() if tool_orchestrator else available_tools
+        context_key = self._planning_context_key(plan_context, tools)
+        suggestions = self.planning_cache.get_or_compute(
+            user_input,
+            context_key,
+            lambda: self._analyze_vague_request(user_input, plan_context, available_tools, tool_orchestrator),
+        )
+        return list(suggestions)
+
+    @staticmethod
+    def _planning_context_key(plan_context, tools: Optional[List[str]]) -> str:
+        """Describe what the planning prompt can see, without the customer's values."""
+        available = sorted(plan_context.to_available_data()) if plan_context else []
+        order = getattr(plan_context, "current_order", None)
+        # The prompt plans one product lookup per ordered SKU
+        order_items = len(order.products_ordered) if order else 0
+        return f"{','.join(available)}|items={order_items}|{','.join(tools or ())}"
+
+    def _analyze_vague_request(self, user_input: str, plan_context, available_tools: Optional[List[str]], tool_orchestrator) -> List[str]:
+        """Ask the LLM for the sequence of actions for a request."""
         try:
             # Get available tools dynamically from tool orchestrator
             if tool_orchestrator and hasattr(tool_orchestrator, 'get_available_tools'):
@@ -114,7 +187,7 @@ Thank you for your patience!
                     response_str = str(parsed_response) if parsed_response is not None else "{}"
                     if response_str.strip():
                         try:
-                            suggestions = json.loads(response_str.strip())
+                            suggestions = loads(response_str.strip())
                         except json.JSONDecodeError:
                             # If JSON parsing fails, create a simple response
                             suggestions = {"action": response_str}
@@ -131,16 +204,34 @@ Thank you for your patience!
                         # Single action
                         return [action_value]
                 
-                logger.warning(f"LLM returned unexpected response format: {response}")
+                logger.warning("LLM returned unexpected response format: %s", response)
                 return self._get_fallback_planning_suggestions(user_input, None)
             except json.JSONDecodeError:
-                logger.warning(f"Could not parse LLM response as JSON: {response}")
+                logger.warning("Could not parse LLM response as JSON: %s", response)
                 return self._get_fallback_planning_suggestions(user_input, None)
                 
         except Exception as e:
-            logger.exception(f"Error in vague request analysis: {e}")
+            logger.exception("Error in vague request analysis: %s", e)
             return self._get_fallback_planning_suggestions(user_input, None)
 
+    def generate_cached_reply(self, prompt: Prompt, user_input: str) -> str:
+        """Get a low-latency reply, reusing one given to the same input.
+
+        Replies are shown verbatim and may echo details from the input, such
+        as a customer's name, so only exact repeats are reused: a merely
+        similar input from another customer gets its own reply. The input is
+        compared on its own rather than as the wrapped user message, and only
+        replies to the same system prompt are reused.
+        """
+        instructions = f"{prompt.system_prompt}\0{prompt.temperature}".encode()
+        context_key = hashlib.blake2b(instructions, digest_size=16).hexdigest()
+        return self.reply_cache.get_or_compute(
+            user_input,
+            context_key,
+            lambda: self.low_latency_client.call_llm(prompt),
+            match_similar=False,
+        )
+
     def validate_tool_addressed_request(self, user_request: str, tool_executed: str, tool_result_summary: str, plan_context) -> Dict[str, Any]:
         """Use LLM to check if the executed tool actually addressed what the user asked for."""
         try:
@@ -151,13 +242,13 @@ Thank you for your patience!
             
             # Parse JSON response
             try:
-                return json.loads(response.strip())
+                return loads(response.strip())
             except json.JSONDecodeError:
-                logger.warning(f"Could not parse validation response: {response}")
+                logger.warning("Could not parse validation response: %s", response)
                 return {"addressed": True, "reason": "Unable to validate", "missing_request": None}
                 
         except Exception as e:
-            logger.exception(f"Error in tool validation: {e}")
+            logger.exception("Error in tool validation: %s", e)
             return {"addressed": True, "reason": "Validation error", "missing_request": None}
 
     def get_agent_statistics(self) -> Dict[str, Any]:
@@ -168,4 +259,6 @@ Thank you for your patience!
             "low_latency_model": self.low_latency_client.model_name,
             "context_builder_initialized": self.context_builder is not None,
             "prompt_builder_initialized": self.prompt_builder is not None,
+            "planning_cache": self.planning_cache.get_statistics(),
+            "reply_cache": self.reply_cache.get_statistics(),
         }
\ No newline at end of file
@@ -9,6 +9,91 @@ from typing import List
 from sierra_agent.core.planning_types import ConversationContext
 from .prompt_types import Prompt
 
+# Planning instructions for vague requests; identical across calls
+_VAGUE_REQUEST_INSTRUCTIONS = """You are an intelligent customer service workflow planner for Sierra Outfitters outdoor gear company. Your job is to analyze what the customer wants and determine the best response approach.
+
+STEP 1 - ANALYZE THE REQUEST TYPE:
+
+A) CONVERSATIONAL REQUESTS (respond conversationally, no tools needed):
+   - Greetings: "hello", "hi", "hey" (standalone, not followed by specific requests) → return "conversational_response"
+   - Thanks: "thanks", "thank you" → return "conversational_response"  
+   - General help: "I need help", "can you help" (without any context or specifics) → return "conversational_response"
+   - General questions: "what can you do", "what services" → return "conversational_response"
+   - IMPORTANT: If user provides email, order numbers, or specific product info, DO NOT treat as conversational
+
+B) INFORMATION REQUESTS (use tools to get specific data):
+   - Order questions: "my order", "order status", "track order" + email/order# → get_order_status
+   - Product search: "show me", "what products", "looking for [product]" → browse_catalog
+   - Product details: "tell me about [specific product]" → get_product_info
+   - Product details from order: "tell me about the products i ordered", "what did i buy" (when order context available) → get_product_info (if multiple products in order, return "get_product_info" for EACH SKU as comma-separated)
+   - Recommendations: "recommend", "suggest products" → get_recommendations
+   - Promotions: "discount", "promotion", "deal", "early risers", "tell me about early risers" → get_early_risers_promotion
+   - Company info: "about company", "contact" → get_company_info
+
+C) MULTI-STEP REQUESTS (use multiple tools in sequence):
+   - "check my order and give recommendations" → get_order_status,get_recommendations
+   - "tell me about the products I ordered and recommend similar items" → get_product_info,get_recommendations
+   - "tell me about my ordered products" (when multiple products in order) → get_product_info (for each SKU)
+   - "show me products and tell me about deals" → browse_catalog,get_early_risers_promotion
+
+STEP 2 - CHECK FOR MISSING INFORMATION:
+   - For get_order_status: need email AND order_number
+     * If we have BOTH email and order_number in available context → use get_order_status
+     * If missing either email or order_number → return "wait_for_missing_info"
+   - For get_product_info: need product_identifier (SKU or name)
+     * If asking about ordered products and order has multiple SKUs, plan to call get_product_info for each SKU
+   - For browse_catalog: can work without parameters or with search terms
+   - For get_recommendations: can use order context or customer preferences
+   - IMPORTANT: Check available context first before assuming missing information
+
+STEP 3 - DETERMINE RESPONSE:
+   - Conversational requests: return "conversational_response"
+   - Single tool needed: return the tool name
+   - Multiple tools needed: return comma-separated tool names
+   - Missing info: return "wait_for_missing_info"
+
+EXAMPLES:
+- "hello" → "conversational_response"
+- "thanks for your help" → "conversational_response"
+- "I need help" (no context) → "conversational_response"
+- "do you have promotions?" → "get_early_risers_promotion"
+- "tell me about early risers" → "get_early_risers_promotion"
+- "show me backpacks" → "browse_catalog"
+- "my order george.hill@example.com #W009" → "get_order_status"
+- "tell me about my order" (no email/order#) → "wait_for_missing_info"
+- "#W006" (context has email: dana@example.com) → "get_order_status"
+- "W006" (context has email: dana@example.com) → "get_order_status" 
+- "dana@example.com" (context has order#: #W006) → "get_order_status"
+- "what do you recommend?" → "get_recommendations"
+- "I want" (incomplete) → "conversational_response\""""
+
+# Tool-choice instructions for the full-context planning retry; identical
+# across calls
+_RETRY_PLANNING_INSTRUCTIONS = """You are helping a customer service agent choose the right tool(s) for a customer request.
+
+Based on the customer's request and the conversation context below, which tool(s) should be used?
+
+INSTRUCTIONS:
+- Consider what the customer is asking for and what context is already available
+- If asking about "products I ordered" and we have order context with SKUs, use get_product_info
+- If asking for recommendations and we have order/product context, use get_recommendations
+- If asking to browse/search without specific context, use browse_catalog
+- Return ONLY the tool name(s), comma-separated if multiple needed
+- If no tool is appropriate, return "conversational_response\""""
+
+# Structured output schema for planning responses; shared, never mutated
+_ACTION_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action": {
+            "type": "string",
+            "description": "The response type or tool name(s) to execute"
+        }
+    },
+    "required": ["action"],
+    "additionalProperties": False
+}
+
 
 class PromptTemplates:
     """Centralized prompt template generation."""
@@ -138,92 +223,43 @@ Generate an enthusiastic, outdoor-branded response."""
         if not tools_description:
             tools_description = "\n".join([f"- {tool}" for tool in available_tools])
         
-        system_prompt = f"""You are an intelligent customer service workflow planner for Sierra Outfitters outdoor gear company. Your job is to analyze what the customer wants and determine the best response approach.
-
-Available Context: {context_summary or "No context available"}
+        # Static instructions first, so repeated calls share a cacheable prompt
+        # prefix; the per-call tools and context follow
+        system_prompt = f"""{_VAGUE_REQUEST_INSTRUCTIONS}
 
 Available Tools:
 {tools_description}
 
-STEP 1 - ANALYZE THE REQUEST TYPE:
-
-A) CONVERSATIONAL REQUESTS (respond conversationally, no tools needed):
-   - Greetings: "hello", "hi", "hey" (standalone, not followed by specific requests) → return "conversational_response"
-   - Thanks: "thanks", "thank you" → return "conversational_response"  
-   - General help: "I need help", "can you help" (without any context or specifics) → return "conversational_response"
-   - General questions: "what can you do", "what services" → return "conversational_response"
-   - IMPORTANT: If user provides email, order numbers, or specific product info, DO NOT treat as conversational
-
-B) INFORMATION REQUESTS (use tools to get specific data):
-   - Order questions: "my order", "order status", "track order" + email/order# → get_order_status
-   - Product search: "show me", "what products", "looking for [product]" → browse_catalog
-   - Product details: "tell me about [specific product]" → get_product_info
-   - Product details from order: "tell me about the products i ordered", "what did i buy" (when order context available) → get_product_info (if multiple products in order, return "get_product_info" for EACH SKU as comma-separated)
-   - Recommendations: "recommend", "suggest products" → get_recommendations
-   - Promotions: "discount", "promotion", "deal", "early risers", "tell me about early risers" → get_early_risers_promotion
-   - Company info: "about company", "contact" → get_company_info
-
-C) MULTI-STEP REQUESTS (use multiple tools in sequence):
-   - "check my order and give recommendations" → get_order_status,get_recommendations
-   - "tell me about the products I ordered and recommend similar items" → get_product_info,get_recommendations
-   - "tell me about my ordered products" (when multiple products in order) → get_product_info (for each SKU)
-   - "show me products and tell me about deals" → browse_catalog,get_early_risers_promotion
-
-STEP 2 - CHECK FOR MISSING INFORMATION:
-   - For get_order_status: need email AND order_number
-     * If we have BOTH email and order_number in available context → use get_order_status
-     * If missing either email or order_number → return "wait_for_missing_info"
-   - For get_product_info: need product_identifier (SKU or name)
-     * If asking about ordered products and order has multiple SKUs, plan to call get_product_info for each SKU
-   - For browse_catalog: can work without parameters or with search terms
-   - For get_recommendations: can use order context or customer preferences
-   - IMPORTANT: Check available context first before assuming missing information
-
-STEP 3 - DETERMINE RESPONSE:
-   - Conversational requests: return "conversational_response"
-   - Single tool needed: return the tool name
-   - Multiple tools needed: return comma-separated tool names
-   - Missing info: return "wait_for_missing_info"
-
-EXAMPLES:
-- "hello" → "conversational_response"
-- "thanks for your help" → "conversational_response"
-- "I need help" (no context) → "conversational_response"
-- "do you have promotions?" → "get_early_risers_promotion"
-- "tell me about early risers" → "get_early_risers_promotion"
-- "show me backpacks" → "browse_catalog"
-- "my order george.hill@example.com #W009" → "get_order_status"
-- "tell me about my order" (no email/order#) → "wait_for_missing_info"
-- "#W006" (context has email: dana@example.com) → "get_order_status"
-- "W006" (context has email: dana@example.com) → "get_order_status" 
-- "dana@example.com" (context has order#: #W006) → "get_order_status"
-- "what do you recommend?" → "get_recommendations"
-- "I want" (incomplete) → "conversational_response"
+Available Context: {context_summary or "No context available"}
 
 Determine the appropriate action to take."""
         
         user_message = f'Customer Request: "{user_input}"'
         
-        json_schema = {
-            "type": "object",
-            "properties": {
-                "action": {
-                    "type": "string",
-                    "description": "The response type or tool name(s) to execute"
-                }
-            },
-            "required": ["action"],
-            "additionalProperties": False
-        }
-        
         return Prompt(
             system_prompt=system_prompt,
             user_message=user_message,
-            expected_json_schema=json_schema,
+            expected_json_schema=_ACTION_JSON_SCHEMA,
             use_structured_output=True,  # Use API structured output properly
             temperature=0.1
         )
 
+    @staticmethod
+    def build_retry_planning_prompt(user_input: str, context_summary: str, tools_description: str) -> Prompt:
+        """Replace the adaptive_planning_service.py full-context retry inline prompt"""
+        # Static instructions first, as in the vague-request prompt
+        system_prompt = f"""{_RETRY_PLANNING_INSTRUCTIONS}
+
+AVAILABLE TOOLS:
+{tools_description}
+
+CONVERSATION CONTEXT:
+{context_summary}"""
+        
+        user_message = f'CUSTOMER REQUEST: "{user_input}"\n\nRESPONSE (tool names only):'
+        
+        return Prompt(system_prompt=system_prompt, user_message=user_message, temperature=0.1)
+
     @staticmethod
     def build_tool_validation_prompt(user_request: str, tool_executed: str, tool_result_summary: str, plan_context: ConversationContext) -> Prompt:
         """Replace llm_service.py:234-255 inline prompt"""
@@ -0,0 +1,263 @@
+"""
+Semantic Cache - Reuse LLM Results Across Paraphrased Requests
+
+This module caches LLM results keyed by the embedding of the request text, so
+that paraphrases such as "check my order" and "what's up with my order" share
+one LLM call. Entries are partitioned by a context key, so a cached result is
+only reused when the surrounding context (available data, tools) matches.
+
+Repeats of the exact same request are answered from a hash lookup before
+any embedding is computed, for a short time after the request was last seen.
+Callers can also restrict a lookup to that exact tier, for values that must
+not be shared between merely similar requests.
+
+Given a database path, entries are also persisted to SQLite so the cache
+survives restarts; values must then be JSON-serializable.
+"""
+
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from operator import mul
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from sierra_agent.utils.compat import DATACLASS_SLOTS
+from sierra_agent.utils.json_utils import dumps_bytes, loads
+
+logger = logging.getLogger(__name__)
+
+# Cosine similarity at or above which a cached request counts as the same request
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+
+# Entries kept before the least recently used one is evicted
+DEFAULT_MAX_ENTRIES = 256
+
+# Seconds an exact repeat of a request is answered without embedding it
+DEFAULT_EXACT_TTL = 300.0
+
+Vector = Tuple[float, ...]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS semantic_cache (
+    id INTEGER PRIMARY KEY,
+    context_key TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    value BLOB NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def _normalize(vector: Sequence[float]) -> Vector:
+    """Scale a vector to unit length so cosine similarity is a dot product."""
+    norm = math.sqrt(sum(map(mul, vector, vector)))
+    if not norm:
+        msg = "Cannot cache a zero-length embedding"
+        raise ValueError(msg)
+    return tuple(x / norm for x in vector)
+
+
+def _exact_key(text: str, context_key: str) -> bytes:
+    """Hash a request and its context for the exact-match lookup."""
+    key = f"{text.strip().lower()}\0{context_key}".encode()
+    return hashlib.blake2b(key, digest_size=16).digest()
+
+
+@dataclass(**DATACLASS_SLOTS)
+class _CacheEntry:
+    """A cached value with the unit embedding of the text that produced it."""
+
+    context_key: str
+    vector: Vector
+    value: Any
+
+
+class SemanticCache:
+    """LRU cache of LLM results looked up by embedding similarity."""
+
+    def __init__(
+        self,
+        embed: Callable[[str], Sequence[float]],
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        db_path: Optional[str] = None,
+        exact_ttl: float = DEFAULT_EXACT_TTL,
+    ) -> None:
+        if max_entries < 1:
+            msg = "max_entries must be at least 1"
+            raise ValueError(msg)
+        self._embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.exact_ttl = exact_ttl
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        # Exact request hash -> (time last seen, entry id); an entry that has
+        # since been evicted makes the exact lookup miss
+        self._exact: OrderedDict[bytes, Tuple[float, int]] = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.exact_hits = 0
+        # Guards the entries and the database across threads
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._open_db(db_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self, text: str, context_key: str, compute: Callable[[], Any], match_similar: bool = True
+    ) -> Any:
+        """Get the cached value for a similar request, or compute and cache it.
+
+        Falsy results are returned but not cached, since they are what the
+        callers' fallbacks produce. If embedding fails, the value is computed
+        without touching the cache. With ``match_similar`` False only exact
+        repeats are answered, and values stored that way are never returned
+        for a merely similar request.
+        """
+        exact_key = _exact_key(text, context_key)
+        with self._lock:
+            cached = self._lookup_exact(exact_key)
+            if cached is not None:
+                self.hits += 1
+                self.exact_hits += 1
+                return cached.value
+            if not match_similar:
+                self.misses += 1
+
+        if not match_similar:
+            vector: Vector = ()
+        else:
+            try:
+                vector = _normalize(self._embed(text))
+            except Exception as e:
+                logger.debug("Semantic cache bypassed, embedding failed: %s", e)
+                return compute()
+
+            with self._lock:
+                entry_id = self._lookup(vector, context_key)
+                if entry_id is not None:
+                    self.hits += 1
+                    self._remember_exact(exact_key, entry_id)
+                    return self._entries[entry_id].value
+                self.misses += 1
+
+        value = compute()
+        if value:
+            with self._lock:
+                self._remember_exact(exact_key, self._store(vector, context_key, value))
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached entry, including persisted ones."""
+        with self._lock:
+            self._entries.clear()
+            self._exact.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM semantic_cache")
+
+    def close(self) -> None:
+        """Close the backing database, if any; the in-memory entries remain."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get cache size and hit counts; exact hits are included in hits."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "exact_hits": self.exact_hits,
+            "misses": self.misses,
+        }
+
+    def _lookup_exact(self, exact_key: bytes) -> Optional[_CacheEntry]:
+        """Find the entry last returned for this exact request, if still fresh."""
+        seen = self._exact.get(exact_key)
+        if seen is None:
+            return None
+        seen_at, entry_id = seen
+        if time.monotonic() - seen_at >= self.exact_ttl or entry_id not in self._entries:
+            del self._exact[exact_key]
+            return None
+        self._entries.move_to_end(entry_id)
+        return self._entries[entry_id]
+
+    def _remember_exact(self, exact_key: bytes, entry_id: int) -> None:
+        """Record which entry answered a request, bounded like the entries."""
+        self._exact[exact_key] = (time.monotonic(), entry_id)
+        self._exact.move_to_end(exact_key)
+        if len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+
+    def _lookup(self, vector: Vector, context_key: str) -> Optional[int]:
+        """Find the id of the most similar entry in the same context above the threshold."""
+        best_id = None
+        best_similarity = self.threshold
+        for entry_id, entry in self._entries.items():
+            # Entries stored without a vector only answer exact repeats
+            if entry.context_key != context_key or not entry.vector:
+                continue
+            similarity = sum(map(mul, vector, entry.vector))
+            if similarity >= best_similarity:
+                best_id, best_similarity = entry_id, similarity
+
+        if best_id is None:
+            return None
+        self._entries.move_to_end(best_id)
+        if self._db is not None:
+            with self._db:
+                self._db.execute(
+                    "UPDATE semantic_cache SET last_used = ? WHERE id = ?", (time.time(), best_id)
+                )
+        return best_id
+
+    def _store(self, vector: Vector, context_key: str, value: Any) -> int:
+        """Add an entry, evicting the least recently used one when full; returns its id."""
+        entry_id = self._next_id
+        self._next_id += 1
+        if self._db is not None:
+            with self._db:
+                if len(self._entries) >= self.max_entries:
+                    self._db.execute("DELETE FROM semantic_cache WHERE id = ?", (next(iter(self._entries)),))
+                self._db.execute(
+                    "INSERT INTO semantic_cache (id, context_key, vector, value, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (entry_id, context_key, array("d", vector).tobytes(), dumps_bytes(value), time.time()),
+                )
+        if len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        self._entries[entry_id] = _CacheEntry(context_key, vector, value)
+        return entry_id
+
+    def _open_db(self, db_path: str) -> None:
+        """Open the backing database and load the most recently used entries."""
+        # Lookups may come from worker threads; the lock serializes access
+        db = sqlite3.connect(db_path, check_same_thread=False)
+        with db:
+            db.execute(_SCHEMA)
+            # Drop rows beyond capacity, e.g. after max_entries was lowered
+            db.execute(
+                "DELETE FROM semantic_cache WHERE id NOT IN "
+                "(SELECT id FROM semantic_cache ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+        rows = db.execute(
+            "SELECT id, context_key, vector, value FROM semantic_cache ORDER BY last_used"
+        ).fetchall()
+        for entry_id, context_key, vector_bytes, value_bytes in rows:
+            vector = array("d")
+            vector.frombytes(vector_bytes)
+            self._entries[entry_id] = _CacheEntry(context_key, tuple(vector), loads(value_bytes))
+        self._next_id = max(self._entries, default=-1) + 1
+        self._db = db
@@ -7,9 +7,9 @@ Clean, strongly typed agent using the evolving planning system.
 import logging
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from sierra_agent.ai.llm_service import LLMService
+from sierra_agent.ai.llm_service import INTERRUPTED_REPLY_NOTICE, LLMService
 from sierra_agent.core.adaptive_planning_service import AdaptivePlanningService
 from sierra_agent.core.conversation import Conversation
 from sierra_agent.tools.tool_orchestrator import ToolOrchestrator
@@ -63,11 +63,20 @@ class SierraAgent:
         self.conversation.clear_conversation()
         self.conversation.add_system_message(f"Session {self.session_id} started")
         
-        logger.info(f"Started conversation session {self.session_id}")
+        logger.info("Started conversation session %s", self.session_id)
         return self.session_id
 
     def process_user_input(self, user_input: str) -> str:
         """Process user input using the evolving plan system."""
+        return "".join(self.process_user_input_stream(user_input))
+
+    def process_user_input_stream(self, user_input: str) -> Iterator[str]:
+        """Process user input, yielding response text as soon as it is generated.
+
+        The conversation records exactly the text yielded, even when the
+        caller stops reading early.
+        """
+        buffer: List[str] = []
         try:
             # Add user message to conversation
             self.conversation.add_user_message(user_input)
@@ -77,28 +86,46 @@ class SierraAgent:
             plan, response = self.planning_service.process_user_input(
                 self.session_id or "default", 
                 user_input, 
-                self.tool_orchestrator
+                self.tool_orchestrator,
+                stream=True
             )
             
-            # Display plan status
-            plan.print_plan()
-            
-            # Ensure we have a valid response
-            final_response = response or "I apologize, but I wasn't able to process your request properly."
+            # Plan status is formatted only when debug logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Plan status:\n%s", plan.format_plan())
             
-            # Add AI response to conversation
-            self.conversation.add_ai_message(final_response)
+            chunks: Iterable[str] = (response,) if isinstance(response, str) else (response or ())
+            for chunk in chunks:
+                if chunk:
+                    buffer.append(chunk)
+                    yield chunk
             
-            # Periodic maintenance
-            self._perform_periodic_checks()
-            
-            return final_response
+            # Ensure we have a valid response
+            if not buffer:
+                fallback = "I apologize, but I wasn't able to process your request properly."
+                buffer.append(fallback)
+                yield fallback
 
         except Exception as e:
-            logger.exception(f"Error processing user input: {e}")
-            fallback_response = "I'm experiencing some technical difficulties right now. Please try again in a moment."
-            self.conversation.add_ai_message(fallback_response)
-            return fallback_response
+            logger.exception("Error processing user input: %s", e)
+            # Keep a partial reply, marked as cut off, rather than tacking an
+            # unrelated apology onto it
+            notice = INTERRUPTED_REPLY_NOTICE if buffer else (
+                "I'm experiencing some technical difficulties right now. Please try again in a moment."
+            )
+            buffer.append(notice)
+            yield notice
+
+        finally:
+            # Also runs when the caller closes the stream early
+            if buffer:
+                self.conversation.add_ai_message("".join(buffer))
+
+        # Periodic maintenance
+        try:
+            self._perform_periodic_checks()
+        except Exception as e:
+            logger.exception("Error in periodic checks: %s", e)
 
     def _perform_periodic_checks(self) -> None:
         """Perform periodic quality checks and analytics updates."""
@@ -117,7 +144,7 @@ class SierraAgent:
             self.conversation.update_quality_score(quality_score)
             self.last_quality_check = self.interaction_count
         except Exception as e:
-            logger.exception(f"Error during quality check: {e}")
+            logger.exception("Error during quality check: %s", e)
 
     def _update_analytics(self) -> None:
         """Simple analytics update."""
@@ -125,7 +152,7 @@ class SierraAgent:
             if self.session_id:
                 self.last_analytics_update = self.interaction_count
         except Exception as e:
-            logger.exception(f"Error updating analytics: {e}")
+            logger.exception("Error updating analytics: %s", e)
 
     def get_llm_status(self) -> Dict[str, Any]:
         """Get the status of unified LLM service."""
@@ -142,11 +169,12 @@ class SierraAgent:
                 "quality_score": self.conversation.quality_score,
                 "conversation_phase": self.conversation.conversation_state.conversation_phase,
                 "urgency_level": self.conversation.conversation_state.urgency_level,
+                "conversation_patterns": self.conversation.get_conversation_patterns(),
                 "last_quality_check": self.last_quality_check,
                 "last_analytics_update": self.last_analytics_update,
             }
         except Exception as e:
-            logger.exception(f"Error generating summary: {e}")
+            logger.exception("Error generating summary: %s", e)
             return {"error": str(e)}
 
     def get_agent_statistics(self) -> Dict[str, Any]:
@@ -154,7 +182,10 @@ class SierraAgent:
         try:
             return {
                 "llm_status": self.get_llm_status(),
-                "planning_stats": {"active_plans": len(self.planning_service.active_plans)},
+                "planning_stats": {
+                    "active_plans": len(self.planning_service.active_plans),
+                    "rule_fast_path_hits": self.planning_service.rule_fast_path_hits,
+                },
                 "tool_stats": self.tool_orchestrator.get_tool_execution_stats(),
                 "conversation_summary": self.get_conversation_summary(),
                 "configuration": {
@@ -169,7 +200,7 @@ class SierraAgent:
                 },
             }
         except Exception as e:
-            logger.exception(f"Error generating statistics: {e}")
+            logger.exception("Error generating statistics: %s", e)
             return {"error": str(e)}
 
     def reset_conversation(self) -> None:
@@ -198,4 +229,4 @@ class SierraAgent:
             self.planning_service.cleanup_completed_plans()
 
         except Exception as e:
-            logger.exception(f"Error ending conversation: {e}")
\ No newline at end of file
+            logger.exception("Error ending conversation: %s", e)
\ No newline at end of file
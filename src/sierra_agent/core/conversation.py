@@ -5,16 +5,136 @@ This module handles conversation state, message history, and customer context
 for the Sierra Outfitters AI agent system.
 """
 
+import bisect
 import logging
+import re
+import sys
+import time
+from array import array
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
-
-from sierra_agent.data.data_types import ToolResult
+from functools import lru_cache
+from itertools import chain, islice
+from operator import methodcaller
+from typing import (
+    IO,
+    Any,
+    DefaultDict,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from sierra_agent.data.data_types import Order, Product, ToolResult
+from sierra_agent.utils.compat import DATACLASS_SLOTS
+from sierra_agent.utils.json_utils import dumps_bytes
 
 logger = logging.getLogger(__name__)
 
+_to_dict = methodcaller("to_dict")
+
+# Keyword detector for conversation state; substring matches, like "orders" -> "order".
+# One scan finds every category, and the group name tells which one matched.
+_STATE_KEYWORDS = re.compile(
+    r"(?P<order_management>order|tracking|shipping)"
+    r"|(?P<product_inquiry>product|gear|boots|tent|hiking)"
+    r"|(?P<customer_service>return|refund|complaint|issue)"
+    r"|(?P<urgency>urgent|asap|emergency|problem|broken)",
+    re.IGNORECASE,
+)
+
+# Shared state values; fields only ever hold one of a handful of these
+_TOPIC_GENERAL = sys.intern("general")
+_URGENCY_NORMAL = sys.intern("normal")
+_URGENCY_HIGH = sys.intern("high")
+
+# Topics in priority order when a message mentions several; a topic's code
+# from classify_message is its position here plus one, 0 meaning no topic
+_TOPIC_PRIORITY = tuple(
+    map(sys.intern, ("order_management", "product_inquiry", "customer_service"))
+)
+_KEYWORD_BITS = {name: 1 << i for i, name in enumerate((*_TOPIC_PRIORITY, "urgency"))}
+_URGENCY_BIT = _KEYWORD_BITS["urgency"]
+_DECISIVE_BITS = _KEYWORD_BITS[_TOPIC_PRIORITY[0]] | _URGENCY_BIT
+
+# Phase by message count: up to 2 greeting, up to 6 exploration, up to 10 resolution
+_PHASE_THRESHOLDS = (2, 6, 10)
+_PHASE_NAMES = tuple(map(sys.intern, ("greeting", "exploration", "resolution", "closing")))
+# Phase for each message count up to the last threshold; beyond it, the last phase
+_PHASE_TABLE = tuple(
+    _PHASE_NAMES[bisect.bisect_left(_PHASE_THRESHOLDS, count)]
+    for count in range(_PHASE_THRESHOLDS[-1] + 1)
+)
+
+# Successful tool results remembered per data type for context lookups
+_TOOL_RESULT_HISTORY = 64
+
+# Entries kept in per-customer histories (sentiment, topics)
+_CONTEXT_HISTORY = 64
+
+
+class _LabelCodes:
+    """Maps categorical labels to one-byte codes for compact histories.
+
+    Known labels are seeded up front; other labels get the next free code
+    on first use, up to 256 distinct labels per vocabulary.
+    """
+
+    __slots__ = ("codes", "names")
+
+    def __init__(self, seed: Iterable[str]) -> None:
+        self.names: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for label in seed:
+            self.encode(label)
+
+    def encode(self, label: str) -> int:
+        code = self.codes.get(label)
+        if code is None:
+            code = len(self.names)
+            if code > 0xFF:
+                msg = f"Too many distinct labels to encode: {label!r}"
+                raise ValueError(msg)
+            label = sys.intern(label)
+            self.codes[label] = code
+            self.names.append(label)
+        return code
+
+    def decode(self, codes: Iterable[int]) -> List[str]:
+        return list(map(self.names.__getitem__, codes))
+
+
+_SENTIMENTS = _LabelCodes(("positive", "neutral", "negative", "mixed"))
+_TOPICS = _LabelCodes((_TOPIC_GENERAL, *_TOPIC_PRIORITY))
+
+
+def _append_bounded(history: "array[int]", code: int) -> None:
+    """Append a code, dropping the oldest once the history is full."""
+    if len(history) >= _CONTEXT_HISTORY:
+        del history[0]  # Shifts at most _CONTEXT_HISTORY bytes
+    history.append(code)
+
+# Messages kept per conversation; the oldest are evicted beyond this
+MAX_HISTORY = 1000
+
+# Rough context budget in tokens (about 4 characters each); once the history
+# passes the threshold share of it, the oldest half is folded into a summary
+CONTEXT_WINDOW_TOKENS = 8000
+_SUMMARIZE_THRESHOLD = 0.8
+_SUMMARY_MAX_CHARS = 400
+
+# Recycled Message objects kept per conversation when reuse is enabled
+_MESSAGE_POOL_SIZE = 256
+
+# Distinct message texts whose classification is memoized
+_CLASSIFY_CACHE_SIZE = 4096
+
 class MessageType(Enum):
     """Types of messages in a conversation."""
 
@@ -22,66 +142,126 @@ class MessageType(Enum):
     AI = "ai"
     SYSTEM = "system"
 
-@dataclass
+# Messages store the raw type string; MessageType stays the public vocabulary
+_USER = MessageType.USER.value
+_AI = MessageType.AI.value
+_SYSTEM = MessageType.SYSTEM.value
+
+@dataclass(**DATACLASS_SLOTS)
 class Message:
     """Represents a single message in the conversation."""
 
     content: str
-    message_type: MessageType
+    message_type: str  # A MessageType value
     timestamp: datetime
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None  # Allocated only when something is recorded
     tool_results: Optional[List[ToolResult]] = None  # Business data associated with this message
     intent: Optional[str] = None  # Intent detected for this message
     plan_id: Optional[str] = None  # Plan that generated this message (for AI messages)
+    # ISO form of the timestamp, filled on first export
+    _iso_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def ensure_metadata(self) -> Dict[str, Any]:
+        """Get the metadata dict for writing, allocating it on first use."""
+        if self.metadata is None:
+            self.metadata = {}
+        return self.metadata
+
+    def serialize_tool_results(self) -> str:
+        """Get this message's tool results formatted for LLM context."""
+        # Each ToolResult caches its own serialized form
+        return "\n".join(f"  {tr.serialize_for_context()}" for tr in self.tool_results or ())
+
+    def timestamp_iso(self) -> str:
+        """Get the timestamp in ISO format, formatted once per message."""
+        iso = self._iso_cache
+        if iso is None:
+            iso = self._iso_cache = self.timestamp.isoformat()
+        return iso
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary format."""
         return {
             "content": self.content,
-            "message_type": self.message_type.value,
-            "timestamp": self.timestamp.isoformat(),
-            "metadata": self.metadata,
-            "tool_results": [tr.to_dict() for tr in self.tool_results] if self.tool_results else None,
+            "message_type": self.message_type,
+            "timestamp": self.timestamp_iso(),
+            "metadata": self.metadata or {},
+            "tool_results": list(map(_to_dict, self.tool_results)) if self.tool_results else None,
             "intent": self.intent,
             "plan_id": self.plan_id,
         }
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CustomerContext:
     """Customer context and preferences."""
 
     customer_id: Optional[str] = None
-    preferences: Dict[str, Any] = field(default_factory=dict)
-    conversation_topics: List[str] = field(default_factory=list)
-    sentiment_history: List[str] = field(default_factory=list)
+    # Optional containers are allocated only once something is recorded
+    preferences: Optional[Dict[str, Any]] = None
+    # Histories hold one-byte label codes; see the *_strings properties
+    conversation_topics: Optional["array[int]"] = None
+    sentiment_history: "array[int]" = field(default_factory=lambda: array("B"))
     last_interaction: Optional[datetime] = None
 
+    @property
+    def sentiment_history_strings(self) -> List[str]:
+        """Sentiment labels, oldest first."""
+        return _SENTIMENTS.decode(self.sentiment_history)
+
+    @property
+    def conversation_topics_strings(self) -> List[str]:
+        """Topic labels, oldest first."""
+        return _TOPICS.decode(self.conversation_topics or ())
+
     def update_sentiment(self, sentiment: str) -> None:
-        """Update customer sentiment history."""
-        self.sentiment_history.append(sentiment)
+        """Update customer sentiment history, keeping the most recent entries."""
+        _append_bounded(self.sentiment_history, _SENTIMENTS.encode(sentiment))
         self.last_interaction = datetime.now()
 
+    def record_topic(self, topic: str) -> None:
+        """Record a conversation topic, keeping the most recent entries."""
+        if self.conversation_topics is None:
+            self.conversation_topics = array("B")
+        _append_bounded(self.conversation_topics, _TOPICS.encode(topic))
+
+    def reset(self) -> None:
+        """Reset to defaults in place."""
+        self.customer_id = None
+        self.preferences = None
+        self.conversation_topics = None
+        del self.sentiment_history[:]
+        self.last_interaction = None
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert customer context to dictionary format."""
+        # Copies, since reset() clears the live containers in place
         return {
             "customer_id": self.customer_id,
-            "preferences": self.preferences,
-            "conversation_topics": self.conversation_topics,
-            "sentiment_history": self.sentiment_history,
+            "preferences": dict(self.preferences or ()),
+            "conversation_topics": self.conversation_topics_strings,
+            "sentiment_history": self.sentiment_history_strings,
             "last_interaction": self.last_interaction.isoformat()
             if self.last_interaction
             else None,
         }
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ConversationState:
     """Current state of the conversation."""
 
-    current_topic: str = "general"
-    urgency_level: str = "normal"
+    current_topic: str = _TOPIC_GENERAL
+    urgency_level: str = _URGENCY_NORMAL
     satisfaction_level: Optional[float] = None
-    conversation_phase: str = "greeting"
-    pending_inputs: List[str] = field(default_factory=list)
+    conversation_phase: str = _PHASE_NAMES[0]
+    pending_inputs: Optional[List[str]] = None  # Allocated only when something is pending
+
+    def reset(self) -> None:
+        """Reset to defaults in place."""
+        self.current_topic = _TOPIC_GENERAL
+        self.urgency_level = _URGENCY_NORMAL
+        self.satisfaction_level = None
+        self.conversation_phase = _PHASE_NAMES[0]
+        self.pending_inputs = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert conversation state to dictionary format."""
@@ -90,39 +270,245 @@ class ConversationState:
             "urgency_level": self.urgency_level,
             "satisfaction_level": self.satisfaction_level,
             "conversation_phase": self.conversation_phase,
-            "pending_inputs": self.pending_inputs,
+            "pending_inputs": list(self.pending_inputs or ()),
         }
 
+@lru_cache(maxsize=_CLASSIFY_CACHE_SIZE)
+def classify_message(content: str) -> Tuple[int, int]:
+    """Classify message content as (topic_code, urgency_code) in one keyword scan.
+
+    topic_code is 0 for no topic, otherwise the 1-based position of the
+    highest-priority topic mentioned; urgency_code is 1 if any urgency
+    keyword appears, else 0.
+    """
+    found = 0
+    for match in _STATE_KEYWORDS.finditer(content):
+        found |= _KEYWORD_BITS[match.lastgroup]  # type: ignore[index]
+        if found & _DECISIVE_BITS == _DECISIVE_BITS:
+            break  # Nothing else can change the outcome
+
+    topic_code = 0
+    for code, topic in enumerate(_TOPIC_PRIORITY, 1):
+        if found & _KEYWORD_BITS[topic]:
+            topic_code = code
+            break
+    return topic_code, 1 if found & _URGENCY_BIT else 0
+
+
+def classify_messages(contents: Iterable[str]) -> List[Tuple[int, int]]:
+    """Classify many messages, e.g. when replaying exported conversations."""
+    return list(map(classify_message, contents))
+
+
+class _MessagePool:
+    """Free list of Message objects recycled by one conversation."""
+
+    def __init__(self, max_size: int = _MESSAGE_POOL_SIZE) -> None:
+        self._free: List[Message] = []
+        self._max_size = max_size
+
+    def acquire(
+        self,
+        content: str,
+        message_type: str,
+        timestamp: datetime,
+        tool_results: Optional[List[ToolResult]] = None,
+        plan_id: Optional[str] = None,
+    ) -> Message:
+        """Get a message with the given fields, reusing a released one if available."""
+        if not self._free:
+            return Message(
+                content=content,
+                message_type=message_type,
+                timestamp=timestamp,
+                tool_results=tool_results,
+                plan_id=plan_id,
+            )
+        message = self._free.pop()
+        message.content = content
+        message.message_type = message_type
+        message.timestamp = timestamp
+        message.tool_results = tool_results
+        message.plan_id = plan_id
+        return message
+
+    def release(self, message: Message) -> None:
+        """Return a message for reuse, dropping references to its payload."""
+        if len(self._free) >= self._max_size:
+            return
+        message.content = ""
+        message.metadata = None
+        message.tool_results = None
+        message.intent = None
+        message.plan_id = None
+        message._iso_cache = None
+        self._free.append(message)
+
+    def clear(self) -> None:
+        """Drop all pooled messages."""
+        self._free.clear()
+
+
+def _estimate_tokens(message: Message) -> int:
+    """Cheap token estimate for a message, about 4 characters per token."""
+    return len(message.content) // 4 + 1
+
+
 class Conversation:
     """Manages conversation state and message history."""
 
-    def __init__(self) -> None:
-        self.messages: List[Message] = []
+    def __init__(
+        self,
+        max_history: int = MAX_HISTORY,
+        context_window_tokens: int = CONTEXT_WINDOW_TOKENS,
+        reuse_messages: bool = False,
+    ) -> None:
+        """Create a conversation.
+
+        With ``reuse_messages``, evicted and cleared Message objects are
+        recycled for new messages, so callers must not keep references to
+        messages beyond their time in the history.
+        """
+        self.messages: Deque[Message] = deque(maxlen=max_history)
+        self._pool: Optional[_MessagePool] = _MessagePool() if reuse_messages else None
+        self._token_estimate = 0
+        # Messages added since start or clear; unlike len(messages), eviction
+        # and summarization never lower it
+        self._message_count = 0
+        self._summarize_at = int(context_window_tokens * _SUMMARIZE_THRESHOLD)
+        # Messages bucketed by type, so type filters and counts don't scan history
+        self._by_type: Dict[str, Deque[Message]] = {_USER: deque(), _AI: deque(), _SYSTEM: deque()}
+        # Secondary index: only the AI messages that carry tool results
+        self._messages_with_tool_results: Deque[Message] = deque()
+        # Bumped whenever the tool-backed index changes; keys the context memo
+        self._tool_results_version = 0
+        self._previous_context_memo: Optional[Tuple[int, int, str]] = None
+        self._tool_results_by_type: DefaultDict[type, Deque[ToolResult]] = defaultdict(
+            lambda: deque(maxlen=_TOOL_RESULT_HISTORY)
+        )
+        # Latest order and product list seen in tool results, kept at append time
+        self._available_data: Dict[str, Any] = {}
         self.customer_context = CustomerContext()
         self.conversation_state = ConversationState()
         self.quality_score: Optional[float] = None
-        self.start_time = datetime.now()
-        self.last_activity = datetime.now()
+        self.start_time = datetime.now()  # Wall clock, for export
+        self._start_monotonic = time.monotonic()  # For duration
+        self.last_activity = self.start_time
+        self._start_time_iso: Optional[str] = None
 
         logger.info("New conversation initialized")
 
-    def add_user_message(self, content: str) -> None:
-        """Add a user message to the conversation."""
-        message = Message(
-            content=content, message_type=MessageType.USER, timestamp=datetime.now()
+    def _new_message(
+        self,
+        content: str,
+        message_type: str,
+        timestamp: datetime,
+        tool_results: Optional[List[ToolResult]] = None,
+        plan_id: Optional[str] = None,
+    ) -> Message:
+        """Create a message, from the pool when message reuse is enabled."""
+        if self._pool is not None:
+            return self._pool.acquire(content, message_type, timestamp, tool_results, plan_id)
+        return Message(
+            content=content,
+            message_type=message_type,
+            timestamp=timestamp,
+            tool_results=tool_results,
+            plan_id=plan_id,
         )
+
+    def _append_message(self, message: Message) -> None:
+        """Append a message and keep the secondary indexes in sync."""
+        evicted = None
+        if len(self.messages) == self.messages.maxlen:
+            evicted = self._evict_oldest()
+        if message.tool_results and message.message_type == _AI:
+            self._messages_with_tool_results.append(message)
+            self._tool_results_version += 1
+            for tool_result in message.tool_results:
+                if tool_result.success:
+                    self._record_tool_result(tool_result)
         self.messages.append(message)
-        self.last_activity = datetime.now()
+        self._message_count += 1
+        self._by_type[message.message_type].append(message)
+        self._token_estimate += _estimate_tokens(message)
+        self.last_activity = message.timestamp
+        if evicted is not None and self._pool is not None:
+            self._pool.release(evicted)
+
+        if self._token_estimate > self._summarize_at and len(self.messages) > 2:
+            self._summarize_prefix(len(self.messages) // 2)
+
+    def _record_tool_result(self, tool_result: ToolResult) -> None:
+        """Index a successful tool result by data type and track the latest business data."""
+        data = tool_result.data
+        self._tool_results_by_type[type(data)].appendleft(tool_result)
+        if isinstance(data, Order):
+            self._available_data["current_order"] = data
+        elif isinstance(data, list) and data and isinstance(data[0], Product):
+            self._available_data["recent_products"] = data
+
+    def _evict_oldest(self) -> Message:
+        """Account for the oldest message before the bounded deques drop it."""
+        # The oldest message overall is also the oldest in each index it is in
+        oldest = self.messages[0]
+        self._by_type[oldest.message_type].popleft()
+        self._token_estimate -= _estimate_tokens(oldest)
+        with_results = self._messages_with_tool_results
+        if with_results and with_results[0] is oldest:
+            with_results.popleft()
+            self._tool_results_version += 1
+        return oldest
+
+    def _summarize_prefix(self, count: int) -> None:
+        """Fold the oldest messages into one system message holding a short summary."""
+        folded = []
+        for _ in range(count):
+            self._evict_oldest()
+            folded.append(self.messages.popleft())
+
+        excerpts = " | ".join(f"{m.message_type}: {m.content[:80]}" for m in folded)
+        summary = self._new_message(
+            f"Summary of {count} earlier messages: {excerpts}"[:_SUMMARY_MAX_CHARS],
+            _SYSTEM,
+            folded[-1].timestamp,
+        )
+        # The summary stands in for the oldest messages, so it goes in front
+        self.messages.appendleft(summary)
+        self._by_type[_SYSTEM].appendleft(summary)
+        self._token_estimate += _estimate_tokens(summary)
+        if self._pool is not None:
+            for message in folded:
+                self._pool.release(message)
+
+        logger.debug("Summarized %d oldest messages", count)
+
+    def add_user_message(self, content: str) -> None:
+        """Add a user message to the conversation."""
+        message = self._new_message(content, _USER, datetime.now())
+        self._append_message(message)
         self._update_conversation_state(content)
 
     def add_ai_message(self, content: str) -> None:
         """Add an AI message to the conversation."""
 
-        message = Message(
-            content=content, message_type=MessageType.AI, timestamp=datetime.now()
+        message = self._new_message(content, _AI, datetime.now())
+        self._append_message(message)
+
+        # Update conversation phase
+        self._update_conversation_phase()
+
+    def add_ai_message_with_results(
+        self,
+        content: str,
+        tool_results: List[ToolResult],
+        plan_id: Optional[str] = None,
+    ) -> None:
+        """Add an AI message together with the tool results that produced it."""
+        message = self._new_message(
+            content, _AI, datetime.now(), tool_results=tool_results or None, plan_id=plan_id
         )
-        self.messages.append(message)
-        self.last_activity = datetime.now()
+        self._append_message(message)
 
         # Update conversation phase
         self._update_conversation_phase()
@@ -130,27 +516,85 @@ class Conversation:
     def get_recent_messages_with_tool_results(self, limit: int = 2) -> List[Message]:
         """Get recent messages that have tool results (for context building)."""
 
-        messages_with_results = []
-        # Look through messages in reverse order
-        for message in reversed(self.messages):
-            if message.tool_results and message.message_type == MessageType.AI:
-                messages_with_results.append(message)
-                if len(messages_with_results) >= limit:
-                    break
+        if limit <= 0:
+            return []
+
+        # Only the indexed AI messages with tool results need to be visited
+        recent = list(islice(reversed(self._messages_with_tool_results), limit))
+        recent.reverse()
+        return recent
+
+    def get_message_history(self, limit: Optional[int] = None) -> List[Message]:
+        """Get the most recent messages in chronological order."""
+        if limit is None:
+            return list(self.messages)
+        history = list(islice(reversed(self.messages), limit))
+        history.reverse()
+        return history
+
+    def build_conversational_context(
+        self, current_tool_results: Optional[List[ToolResult]] = None, limit: int = 2
+    ) -> str:
+        """Build a text summary of recent tool-backed replies plus the current results."""
+        # Common case: nothing tool-backed yet, so skip building anything
+        if not current_tool_results and not self._messages_with_tool_results:
+            return ""
+
+        previous = self._get_previous_context(limit)
+        if not current_tool_results:
+            return previous
+
+        current = "\n".join(chain(
+            ("Current results:",),
+            (f"  {tr.serialize_for_context()}" for tr in current_tool_results),
+        ))
+        return f"{previous}\n\n{current}" if previous else current
+
+    def _get_previous_context(self, limit: int) -> str:
+        """Get the previous-interactions block, rebuilt only when the tool-backed index changes."""
+        memo = self._previous_context_memo
+        if memo is not None and memo[0] == self._tool_results_version and memo[1] == limit:
+            return memo[2]
+
+        previous = "\n\n".join(
+            f"Previous response: {message.content[:200]}\n{message.serialize_tool_results()}"
+            for message in self.get_recent_messages_with_tool_results(limit)
+        )
+        self._previous_context_memo = (self._tool_results_version, limit, previous)
+        return previous
+
+    def get_previous_tool_results(self, result_type: type, limit: int = 3) -> List[ToolResult]:
+        """Get the most recent successful tool results whose data is of the given type, newest first."""
+        results = self._tool_results_by_type.get(result_type)
+        if not results:
+            return []
+        return list(islice(results, limit))
+
+    def get_available_data(self) -> Dict[str, Any]:
+        """Get the most recent order and product results seen in this conversation."""
+        return dict(self._available_data)
 
-        # Return in chronological order
-        messages_with_results.reverse()
+    def _get_messages_of_type(self, message_type: str) -> List[Message]:
+        """Get all messages of one type from its bucket."""
+        return list(self._by_type[message_type])
 
-        return messages_with_results
+    def get_user_messages(self) -> List[Message]:
+        """Get all user messages."""
+        return self._get_messages_of_type(_USER)
+
+    def get_ai_messages(self) -> List[Message]:
+        """Get all AI messages."""
+        return self._get_messages_of_type(_AI)
+
+    def get_system_messages(self) -> List[Message]:
+        """Get all system messages."""
+        return self._get_messages_of_type(_SYSTEM)
 
     def add_system_message(self, content: str) -> None:
         """Add a system message to the conversation."""
 
-        message = Message(
-            content=content, message_type=MessageType.SYSTEM, timestamp=datetime.now()
-        )
-        self.messages.append(message)
-        self.last_activity = datetime.now()
+        message = self._new_message(content, _SYSTEM, datetime.now())
+        self._append_message(message)
 
     def update_quality_score(self, score: float) -> None:
         """Update conversation quality score."""
@@ -159,46 +603,23 @@ class Conversation:
     def _update_conversation_state(self, content: str) -> None:
         """Update conversation state based on message content."""
 
-        content_lower = content.lower()
+        topic_code, urgency_code = classify_message(content)
 
         # Topic detection
-        if any(word in content_lower for word in ["order", "tracking", "shipping"]):
-            self.conversation_state.current_topic = "order_management"
-
-        elif any(
-            word in content_lower
-            for word in ["product", "gear", "boots", "tent", "hiking"]
-        ):
-            self.conversation_state.current_topic = "product_inquiry"
-
-        elif any(
-            word in content_lower for word in ["return", "refund", "complaint", "issue"]
-        ):
-            self.conversation_state.current_topic = "customer_service"
+        if topic_code:
+            self.conversation_state.current_topic = _TOPIC_PRIORITY[topic_code - 1]
 
         # Urgency detection
-        if any(
-            word in content_lower
-            for word in ["urgent", "asap", "emergency", "problem", "broken"]
-        ):
-            self.conversation_state.urgency_level = "high"
+        if urgency_code:
+            self.conversation_state.urgency_level = _URGENCY_HIGH
 
     def _update_conversation_phase(self) -> None:
         """Update conversation phase based on message count."""
 
-        message_count = len(self.messages)
-
-        if message_count <= 2:
-            self.conversation_state.conversation_phase = "greeting"
-
-        elif message_count <= 6:
-            self.conversation_state.conversation_phase = "exploration"
-
-        elif message_count <= 10:
-            self.conversation_state.conversation_phase = "resolution"
-
-        else:
-            self.conversation_state.conversation_phase = "closing"
+        count = self._message_count
+        self.conversation_state.conversation_phase = (
+            _PHASE_TABLE[count] if count < len(_PHASE_TABLE) else _PHASE_NAMES[-1]
+        )
 
 
     def get_conversation_length(self) -> int:
@@ -208,18 +629,98 @@ class Conversation:
 
     def get_conversation_duration(self) -> float:
         """Get conversation duration in seconds."""
-        return (datetime.now() - self.start_time).total_seconds()
+        return time.monotonic() - self._start_monotonic
+
+    def get_customer_sentiment_trend(self, limit: int = 5) -> List[str]:
+        """Get the most recent customer sentiments, oldest first."""
+        history = self.customer_context.sentiment_history
+        return _SENTIMENTS.decode(history[max(len(history) - limit, 0):])
+
+    def get_conversation_patterns(self) -> Dict[str, Any]:
+        """Get message mix and current state of the conversation."""
+        by_type = self._by_type
+        return {
+            "user_messages": len(by_type[_USER]),
+            "ai_messages": len(by_type[_AI]),
+            "system_messages": len(by_type[_SYSTEM]),
+            "current_topic": self.conversation_state.current_topic,
+            "conversation_phase": self.conversation_state.conversation_phase,
+            "urgency_level": self.conversation_state.urgency_level,
+        }
 
 
+    def iter_message_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield messages as plain dictionaries one at a time."""
+        return map(_to_dict, self.messages)
+
+    def export_conversation(self) -> Dict[str, Any]:
+        """Export the full conversation as plain dictionaries."""
+        export = self._export_header()
+        export["messages"] = list(self.iter_message_dicts())
+        return export
+
+    def export_conversation_json(self) -> bytes:
+        """Export the full conversation as UTF-8 JSON bytes."""
+        # Messages are encoded straight from the deque by the encoder's
+        # default hook, skipping the intermediate list of dicts
+        export: Dict[str, Any] = self._export_header()
+        export["messages"] = self.messages
+        return dumps_bytes(export)
+
+    def write_conversation_json(self, fp: IO[bytes]) -> None:
+        """Write the conversation as JSON, encoding one message at a time.
+
+        Produces the same document as export_conversation_json without
+        holding every message dict in memory at once.
+        """
+        header = dumps_bytes(self._export_header())
+        fp.write(header[:-1])  # Reopen the object to append the messages
+        fp.write(b',"messages":[')
+        for i, message in enumerate(self.messages):
+            if i:
+                fp.write(b",")
+            fp.write(dumps_bytes(message))
+        fp.write(b"]}")
+
+    def _export_header(self) -> Dict[str, Any]:
+        """Conversation-level export fields, everything except the messages."""
+        return {
+            "customer_context": self.customer_context.to_dict(),
+            "conversation_state": self.conversation_state.to_dict(),
+            "quality_score": self.quality_score,
+            "start_time": self._get_start_time_iso(),
+            "last_activity": self.last_activity.isoformat(),
+            "duration_seconds": self.get_conversation_duration(),
+        }
+
+    def _get_start_time_iso(self) -> str:
+        """Get the start time in ISO format, formatted once per session."""
+        if self._start_time_iso is None:
+            self._start_time_iso = self.start_time.isoformat()
+        return self._start_time_iso
+
     def clear_conversation(self) -> None:
         """Clear the conversation and reset state."""
 
+        if self._pool is not None:
+            for message in self.messages:
+                self._pool.release(message)
         self.messages.clear()
+        for bucket in self._by_type.values():
+            bucket.clear()
+        self._messages_with_tool_results.clear()
+        self._tool_results_version += 1
+        self._token_estimate = 0
+        self._message_count = 0
+        self._tool_results_by_type.clear()
+        self._available_data.clear()
         self.quality_score = None
         self.start_time = datetime.now()
-        self.last_activity = datetime.now()
-        self.customer_context = CustomerContext()
-        self.conversation_state = ConversationState()
+        self._start_monotonic = time.monotonic()
+        self.last_activity = self.start_time
+        self._start_time_iso = None
+        self.customer_context.reset()
+        self.conversation_state.reset()
 
         logger.info("Conversation cleared and reset")
 
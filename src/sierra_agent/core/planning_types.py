@@ -9,13 +9,84 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from sierra_agent.data.data_types import BusinessData, ToolResult, Order, Product
 from sierra_agent.tools.tool_orchestrator import ToolOrchestrator
+from sierra_agent.utils.compat import DATACLASS_SLOTS
 
+# Keyword scanner for EvolvingPlan; substring matches, and one pass collects
+# every category as a bitmask of group names. Results are memoized per input,
+# so the several checks made during one turn share a single scan.
+_ACTION_KEYWORDS = re.compile(
+    r"(?P<order>order|track|#w)"
+    r"|(?P<product>product)"
+    r"|(?P<recommend>recommend)"
+    r"|(?P<search>search)"
+    r"|(?P<find>find)"
+    r"|(?P<promotion>discount|promotion|early risers)",
+    re.IGNORECASE,
+)
+_ACTION_BITS = {name: 1 << i for i, name in enumerate(_ACTION_KEYWORDS.groupindex)}
+_ORDER_BIT = _ACTION_BITS["order"]
+_PRODUCT_BIT = _ACTION_BITS["product"]
+_RECOMMEND_BIT = _ACTION_BITS["recommend"]
+_PRODUCT_REQUEST_BITS = _PRODUCT_BIT | _RECOMMEND_BIT | _ACTION_BITS["search"]
+_PROMOTION_BIT = _ACTION_BITS["promotion"]
+_SEARCH_QUERY_BITS = _ACTION_BITS["search"] | _ACTION_BITS["find"]
 
-@dataclass
+# Parameters each tool needs present and non-empty before it runs; tools not
+# listed need none
+_REQUIRED_TOOL_PARAMS: Dict[str, Tuple[str, ...]] = {
+    "get_order_status": ("email", "order_number"),
+    "get_product_details": ("skus",),
+    "search_products": ("query",),
+    "get_product_info": ("product_identifier",),
+}
+
+# Words suggesting a request carries more than one intent
+_MULTI_INTENT_WORDS = re.compile(r"\b(?:and|also|plus|then|but)\b", re.IGNORECASE)
+
+# Longest request, in words, that the keyword rules are trusted with alone
+_DIRECT_ACTION_MAX_WORDS = 8
+
+# Whole-word phrases that mark a request as an order status lookup, unlike a
+# bare "order", which also appears when ordering, cancelling or returning
+_ORDER_STATUS_PHRASES = re.compile(
+    r"\b(?:where(?:'s|\s+is)|status\s+of|track|check(?:\s+on)?)\s+(?:my\s+|the\s+|an\s+)?order\b"
+    r"|\border\s+status\b",
+    re.IGNORECASE,
+)
+# An order number as the catalog writes it, e.g. "#W001"
+_ORDER_NUMBER_RE = re.compile(r"#W\d+\b|\bW\d{3,}\b", re.IGNORECASE)
+# The one promotion, named outright
+_PROMOTION_NAME = re.compile(r"\bearly\s+risers?\b", re.IGNORECASE)
+
+# Identifiers pulled out of free-form user input
+_EMAIL_RE = re.compile(r"[\w.-]+@[\w.-]+\.\w+")
+_ORDER_RE = re.compile(r"#?([A-Z]\d+)", re.IGNORECASE)
+# Tried in order: an introduction, a bare name, then any "First Last" pair
+_NAME_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"(?:I'm|I am|my name is)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)",
+        r"^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)$",
+        r"([A-Z][a-z]+\s+[A-Z][a-z]+)",
+    )
+)
+
+
+@lru_cache(maxsize=4096)  # Short requests like "track my order" recur often
+def _scan_action_keywords(text: str) -> int:
+    """Get the bitmask of keyword categories mentioned in the text."""
+    hits = 0
+    for match in _ACTION_KEYWORDS.finditer(text):
+        hits |= _ACTION_BITS[match.lastgroup]  # type: ignore[index]
+    return hits
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ExecutedStep:
     """Record of a completed execution step."""
     tool_name: str
@@ -32,7 +103,7 @@ class ExecutedStep:
         return self.result.data if self.result.success else None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ConversationContext:
     """Unified context system - replaces all other context approaches."""
     # Core business data
@@ -47,88 +118,85 @@ class ConversationContext:
     # Consolidated context storage
     interaction_summaries: List[str] = field(default_factory=list)  # Replaces MinimalHistoryItem
     metadata: Dict[str, Union[str, int, float, bool, List[str]]] = field(default_factory=dict)  # Replaces context_storage
+    # Bumped when the customer or order fields or found products change, so
+    # text derived from them can be reused until then
+    version: int = field(default=0, compare=False, repr=False)
     
     def update_from_result(self, result: ToolResult) -> None:
         """Update context with new tool result data."""
         if not result.success or not result.data:
             return
-            
-        if isinstance(result.data, Order):
-            self.current_order = result.data
-            self.customer_email = result.data.email
-            self.order_number = result.data.order_number
-        elif isinstance(result.data, list) and result.data and isinstance(result.data[0], Product):
-            self.found_products = result.data
-        elif isinstance(result.data, Product):
-            if result.data not in self.found_products:
-                self.found_products.append(result.data)
-                
+        apply = _RESULT_APPLIERS.get(result.data_kind)
+        if apply:
+            apply(self, result.data)
+
+    def _apply_order(self, order: Order) -> None:
+        self.current_order = order
+        self.customer_email = order.email
+        self.order_number = order.order_number
+        self.version += 1
+
+    def _apply_product_list(self, products: List[Product]) -> None:
+        self.found_products = products
+        self.version += 1
+
+    def _apply_product(self, product: Product) -> None:
+        if product not in self.found_products:
+            self.found_products.append(product)
+            self.version += 1
+
     def get_tool_params(self, tool_name: str, user_input: str = "") -> Dict[str, Any]:
         """Get parameters for a tool using accumulated context."""
-        if tool_name == "get_order_status":
-            email = self.customer_email or self._extract_email(user_input)
-            order_num = self.order_number or self._extract_order_number(user_input)
-            name = self.customer_name or self._extract_name(user_input)
-            params = {"email": email, "order_number": order_num}
-            if name:
-                params["name"] = name
-            return params
-        elif tool_name == "get_product_details":
-            if self.current_order:
-                return {"skus": self.current_order.products_ordered}
-            return {"skus": []}
-        elif tool_name == "get_product_info":
-            # Extract SKU from user input or use order context
-            if self.current_order and self.current_order.products_ordered:
-                # If user is asking about their ordered products, return the first SKU
-                # For multiple products, the planner should call this tool multiple times
-                return {"product_identifier": self.current_order.products_ordered[0]}
-            # Otherwise try to extract from user input
-            # This is a simple implementation - could be enhanced
-            return {"product_identifier": user_input}
-        elif tool_name == "search_products":
-            query = self.search_query or user_input
-            return {"query": query}
-        elif tool_name == "get_product_recommendations":
-            # If we have order context, use the order products as preferences for recommendations
-            if self.current_order and self.current_order.products_ordered:
-                # Convert order SKUs to product preferences by getting product names
-                product_preferences = []
-                for sku in self.current_order.products_ordered:
-                    # Use the SKU directly as a preference term
-                    product_preferences.append(sku)
-                return {"category": None, "preferences": product_preferences}
-            else:
-                return {"category": None, "preferences": self.customer_preferences}
-        # elif tool_name == "get_order_history":  # COMMENTED OUT - Not needed for assignment
-        #     email = self.customer_email or self._extract_email(user_input)
-        #     return {"email": email, "limit": 10}
-        else:
-            return {}
+        builder = _TOOL_PARAM_BUILDERS.get(tool_name)
+        return builder(self, user_input) if builder else {}
     
     def has_required_params(self, tool_name: str, params: Dict[str, Any]) -> bool:
         """Check if we have sufficient parameters for a tool."""
-        if tool_name == "get_order_status":
-            return bool(params.get("email") and params.get("order_number"))
-        elif tool_name == "get_product_details":
-            return bool(params.get("skus"))
-        elif tool_name == "search_products":
-            return bool(params.get("query"))
-        elif tool_name == "get_product_info":
-            return bool(params.get("product_identifier"))
-        # elif tool_name == "get_order_history":  # COMMENTED OUT - Not needed for assignment
-        #     return bool(params.get("email"))
-        else:
-            return True
+        return all(params.get(name) for name in _REQUIRED_TOOL_PARAMS.get(tool_name, ()))
+    
+    def _order_status_params(self, user_input: str) -> Dict[str, Any]:
+        email = self.customer_email or self._extract_email(user_input)
+        order_num = self.order_number or self._extract_order_number(user_input)
+        name = self.customer_name or self._extract_name(user_input)
+        params = {"email": email, "order_number": order_num}
+        if name:
+            params["name"] = name
+        return params
+    
+    def _product_details_params(self, user_input: str) -> Dict[str, Any]:
+        if self.current_order:
+            return {"skus": self.current_order.products_ordered}
+        return {"skus": []}
+    
+    def _product_info_params(self, user_input: str) -> Dict[str, Any]:
+        # Extract SKU from user input or use order context
+        if self.current_order and self.current_order.products_ordered:
+            # If user is asking about their ordered products, return the first SKU
+            # For multiple products, the planner should call this tool multiple times
+            return {"product_identifier": self.current_order.products_ordered[0]}
+        # Otherwise try to extract from user input
+        # This is a simple implementation - could be enhanced
+        return {"product_identifier": user_input}
+    
+    def _search_params(self, user_input: str) -> Dict[str, Any]:
+        query = self.search_query or user_input
+        return {"query": query}
+    
+    def _recommendation_params(self, user_input: str) -> Dict[str, Any]:
+        # If we have order context, use the order products as preferences for recommendations
+        if self.current_order and self.current_order.products_ordered:
+            # Use the SKUs directly as preference terms
+            return {"category": None, "preferences": list(self.current_order.products_ordered)}
+        return {"category": None, "preferences": self.customer_preferences}
             
     def _extract_email(self, text: str) -> Optional[str]:
         """Simple email extraction."""
-        match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+        match = _EMAIL_RE.search(text)
         return match.group(0) if match else None
     
     def _extract_order_number(self, text: str) -> Optional[str]:
         """Simple order number extraction."""
-        match = re.search(r'#?([A-Z]\d+)', text, re.IGNORECASE)
+        match = _ORDER_RE.search(text)
         if match:
             # Always return with # prefix to match data format
             return f"#{match.group(1)}"
@@ -137,14 +205,9 @@ class ConversationContext:
     def _extract_name(self, text: str) -> Optional[str]:
         """Simple name extraction - look for proper names."""
         # Look for patterns like "I'm John", "My name is Jane", "John Smith", etc.
-        patterns = [
-            r"(?:I'm|I am|my name is)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)",
-            r"^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)$",  # Just a name by itself
-            r"([A-Z][a-z]+\s+[A-Z][a-z]+)",  # First Last name pattern
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text.strip(), re.IGNORECASE)
+        stripped = text.strip()
+        for pattern in _NAME_RES:
+            match = pattern.search(stripped)
             if match:
                 return match.group(1).strip()
         return None
@@ -176,13 +239,13 @@ class ConversationContext:
             return ""
         return "Recent Context:\n" + "\n".join(f"- {summary}" for summary in self.interaction_summaries) + "\n\n"
     
-    def get_conversation_context_string(self, phase: str, topic: str, executed_steps: List) -> str:
+    def get_conversation_context_string(self, phase: str, topic: str, executed_steps: List[ExecutedStep]) -> str:
         """Replace manual context string building in adaptive_planning_service"""
         context_parts = []
         context_parts.append(f"Phase: {phase}")
         context_parts.append(f"Topic: {topic}")
         if executed_steps:
-            step_names = [step.tool_name if hasattr(step, 'tool_name') else str(step) for step in executed_steps]
+            step_names = [step.tool_name for step in executed_steps]
             context_parts.append(f"Executed: {step_names}")
         return ", ".join(context_parts)
     
@@ -191,7 +254,27 @@ class ConversationContext:
         return f"Original request: {original_request}"
 
 
-@dataclass
+# Context parameter builders per tool; tools without one take no parameters
+# from the context
+_TOOL_PARAM_BUILDERS: Dict[str, Callable[[ConversationContext, str], Dict[str, Any]]] = {
+    "get_order_status": ConversationContext._order_status_params,
+    "get_product_details": ConversationContext._product_details_params,
+    "get_product_info": ConversationContext._product_info_params,
+    "search_products": ConversationContext._search_params,
+    "get_product_recommendations": ConversationContext._recommendation_params,
+    # "get_order_history": COMMENTED OUT - Not needed for assignment
+}
+
+# Context updates per tool result data kind; other kinds leave the context
+# unchanged
+_RESULT_APPLIERS: Dict[str, Callable[[ConversationContext, Any], None]] = {
+    "order": ConversationContext._apply_order,
+    "product_list": ConversationContext._apply_product_list,
+    "product": ConversationContext._apply_product,
+}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class EvolvingPlan:
     """A plan that evolves during execution and across conversation turns."""
     plan_id: str
@@ -200,35 +283,65 @@ class EvolvingPlan:
     executed_steps: List[ExecutedStep] = field(default_factory=list)
     is_complete: bool = False
     created_at: datetime = field(default_factory=datetime.now)
+    # Last user input whose details were extracted into the context
+    _absorbed_input: Optional[str] = field(default=None, repr=False, compare=False)
     
     def determine_next_action(self, user_input: str) -> Optional[str]:
         """Determine what tool to execute based on user input and context."""
-        user_lower = user_input.lower()
+        hits = _scan_action_keywords(user_input)
         
         # Order-related requests
-        if any(word in user_lower for word in ["order", "track", "#w"]):
+        if hits & _ORDER_BIT:
             if not self.context.current_order:
                 return "get_order_status"
-            elif "product" in user_lower:
+            elif hits & _PRODUCT_BIT:
                 return "get_product_details"
         
         # Product-related requests
-        elif any(word in user_lower for word in ["product", "recommend", "search"]):
-            if "recommend" in user_lower and self.context.current_order:
+        elif hits & _PRODUCT_REQUEST_BITS:
+            if hits & _RECOMMEND_BIT and self.context.current_order:
                 return "get_product_recommendations"
             else:
                 return "search_products"
                 
         # Promotion requests
-        elif any(word in user_lower for word in ["discount", "promotion", "early risers"]):
+        elif hits & _PROMOTION_BIT:
             return "get_early_risers_promotion"
             
         return None
     
+    def determine_direct_action(self, user_input: str) -> Optional[str]:
+        """Get an action without the LLM only when the intent is unmistakable.
+
+        Keyword hits are not enough: "order" and "recommend" appear in
+        requests to place, cancel or return orders and in open questions.
+        Only two kinds of short, single-intent request qualify. The first is
+        an order status lookup, recognized by an order number, an email or a
+        phrase like "where is my order", while no order is loaded yet. The
+        second names the Early Risers promotion.
+        """
+        # Cheapest checks first: counting spaces allocates nothing, and long
+        # requests are the ones the LLM plans anyway
+        if user_input.count(" ") >= _DIRECT_ACTION_MAX_WORDS:
+            return None
+        if _MULTI_INTENT_WORDS.search(user_input):
+            return None
+        wants_order = bool(
+            _ORDER_NUMBER_RE.search(user_input)
+            or _EMAIL_RE.search(user_input)
+            or _ORDER_STATUS_PHRASES.search(user_input)
+        )
+        wants_promotion = bool(_PROMOTION_NAME.search(user_input))
+        if wants_order and not wants_promotion:
+            return None if self.context.current_order else "get_order_status"
+        if wants_promotion and not wants_order:
+            return "get_early_risers_promotion"
+        return None
+    
     def execute_action(self, action: str, user_input: str, tool_orchestrator: ToolOrchestrator, enhanced_params: Optional[Dict[str, Any]] = None) -> Optional[ExecutedStep]:
         """Execute an action using current context."""
         # Update context with current user input
-        if "search" in user_input.lower() or "find" in user_input.lower():
+        if _scan_action_keywords(user_input) & _SEARCH_QUERY_BITS:
             self.context.search_query = user_input
             
         # Extract and store any new information from user input
@@ -263,40 +376,51 @@ class EvolvingPlan:
     
     def _update_context_from_user_input(self, user_input: str) -> None:
         """Extract and store any new information from user input."""
+        # The planning service absorbs each input before executing its
+        # actions; extraction only fills empty fields, so a repeat finds nothing
+        if user_input == self._absorbed_input:
+            return
+        self._absorbed_input = user_input
+        
         # Extract email if we don't have one
         if not self.context.customer_email:
             email = self.context._extract_email(user_input)
             if email:
                 self.context.customer_email = email
+                self.context.version += 1
                 
         # Extract order number if we don't have one
         if not self.context.order_number:
             order_num = self.context._extract_order_number(user_input)
             if order_num:
                 self.context.order_number = order_num
+                self.context.version += 1
                 
         # Extract name if we don't have one
         if not self.context.customer_name:
             name = self.context._extract_name(user_input)
             if name:
                 self.context.customer_name = name
+                self.context.version += 1
     
-    def print_plan(self) -> None:
-        """Print current plan state."""
-        print(f"\n📋 EVOLVING PLAN: {self.plan_id}")
-        print(f"🎯 Original Request: {self.original_request}")
-        print(f"📊 Status: {'COMPLETE' if self.is_complete else 'IN_PROGRESS'}")
+    def format_plan(self) -> str:
+        """Format current plan state as display text."""
+        lines = [
+            f"📋 EVOLVING PLAN: {self.plan_id}",
+            f"🎯 Original Request: {self.original_request}",
+            f"📊 Status: {'COMPLETE' if self.is_complete else 'IN_PROGRESS'}",
+        ]
         
         if self.executed_steps:
-            print(f"✅ Executed Steps:")
+            lines.append("✅ Executed Steps:")
             for step in self.executed_steps:
                 icon = "✅" if step.was_successful else "❌"
-                print(f"  {icon} {step.tool_name}")
+                lines.append(f"  {icon} {step.tool_name}")
         
         context_keys = []
         if self.context.customer_email: context_keys.append("email")
         if self.context.current_order: context_keys.append("order")
         if self.context.found_products: context_keys.append("products")
         if context_keys:
-            print(f"💾 Context: {', '.join(context_keys)}")
-        print()
\ No newline at end of file
+            lines.append(f"💾 Context: {', '.join(context_keys)}")
+        return "\n".join(lines)
\ No newline at end of file
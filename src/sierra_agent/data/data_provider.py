@@ -13,13 +13,50 @@ import os
 import random
 import re
 import string
+from dataclasses import dataclass
 from datetime import datetime, time, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from sierra_agent.utils.compat import DATACLASS_SLOTS
 
 from .data_types import Order, Product, Promotion
 
 logger = logging.getLogger(__name__)
 
+# Punctuation dropped from search queries before splitting them into words;
+# hyphens stay, since tags like "High-Tech" contain them
+_QUERY_PUNCTUATION = str.maketrans(dict.fromkeys("?!.,;:#\"", " "))
+
+# Runs of word characters, the units a whole-word regex match lines up with
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(**DATACLASS_SLOTS)
+class _CatalogEntry:
+    """A catalog product with its searchable fields lower-cased and split once."""
+
+    product: Product
+    name: str
+    tags: str
+    description: str
+    tag_set: FrozenSet[str]
+    name_words: FrozenSet[str]
+    tag_words: FrozenSet[str]
+    description_words: FrozenSet[str]
+
+
+def _word_matcher(word: str) -> Callable[[FrozenSet[str], str], bool]:
+    """Build a whole-word test of a query word against a field's words and text.
+
+    A word made only of word characters matches exactly when it is one of
+    the field's words; others, like "high-tech", need a boundary regex.
+    """
+    if _WORD_RE.fullmatch(word):
+        return lambda words, text: word in words
+    pattern = re.compile(r"\b" + re.escape(word) + r"\b")
+    return lambda words, text: pattern.search(text) is not None
+
+
 class DataProvider:
     """Centralized data provider for Sierra Outfitters business operations."""
 
@@ -30,9 +67,17 @@ class DataProvider:
         self.customer_orders: List[Dict[str, Any]] = []
         self.product_catalog: List[Dict[str, Any]] = []
 
+        # Lookup tables over the loaded data, built once so requests do not
+        # scan the raw records
+        self._orders_by_key: Dict[Tuple[str, str], Order] = {}
+        self._products_by_sku: Dict[str, Product] = {}
+        self._products_by_tag: Dict[str, List[Product]] = {}
+        self._catalog_entries: List[_CatalogEntry] = []
+
         # Load data files
         self._load_customer_orders()
         self._load_product_catalog()
+        self._build_indexes()
 
         logger.info("DataProvider initialized")
 
@@ -50,7 +95,7 @@ class DataProvider:
                 self.customer_orders = []
         except Exception as e:
 
-            logger.exception(f"Error loading customer orders: {e}")
+            logger.exception("Error loading customer orders: %s", e)
             self.customer_orders = []
 
     def _load_product_catalog(self) -> None:
@@ -67,26 +112,18 @@ class DataProvider:
                 self.product_catalog = []
         except Exception as e:
 
-            logger.exception(f"Error loading product catalog: {e}")
+            logger.exception("Error loading product catalog: %s", e)
             self.product_catalog = []
 
-    def get_order_status(self, email: str, order_number: str) -> Optional[Order]:
-        """
-        Get order status information.
-
-        Args:
-            email: Customer email address
-            order_number: Order number (e.g., #W001)
+    def _build_indexes(self) -> None:
+        """Index orders by email and order number, and products by SKU and tag.
 
-        Returns:
-            Order object or None if not found
+        On duplicate keys the first record wins, as it did for linear scans.
         """
-
         for order_data in self.customer_orders:
-            if (order_data["Email"].lower() == email.lower() and
-                order_data["OrderNumber"].lower() == order_number.lower()):
-
-                return Order(
+            key = (order_data["Email"].lower(), order_data["OrderNumber"].lower())
+            if key not in self._orders_by_key:
+                self._orders_by_key[key] = Order(
                     customer_name=order_data["CustomerName"],
                     email=order_data["Email"],
                     order_number=order_data["OrderNumber"],
@@ -95,21 +132,49 @@ class DataProvider:
                     tracking_number=order_data.get("TrackingNumber")
                 )
 
+        for product_data in self.product_catalog:
+            tags = product_data.get("Tags", [])
+            product = Product(
+                product_name=product_data["ProductName"],
+                sku=product_data["SKU"],
+                inventory=product_data["Inventory"],
+                description=product_data["Description"],
+                tags=tags
+            )
+            self._products_by_sku.setdefault(product.sku, product)
+            tag_set = frozenset(tag.lower() for tag in tags)
+            for tag in tag_set:
+                self._products_by_tag.setdefault(tag, []).append(product)
+            name = product_data.get("ProductName", "").lower()
+            tag_text = " ".join(tags).lower()
+            description = product_data.get("Description", "").lower()
+            self._catalog_entries.append(_CatalogEntry(
+                product=product,
+                name=name,
+                tags=tag_text,
+                description=description,
+                tag_set=tag_set,
+                name_words=frozenset(_WORD_RE.findall(name)),
+                tag_words=frozenset(_WORD_RE.findall(tag_text)),
+                description_words=frozenset(_WORD_RE.findall(description)),
+            ))
 
-        return None
+    def get_order_status(self, email: str, order_number: str) -> Optional[Order]:
+        """
+        Get order status information.
+
+        Args:
+            email: Customer email address
+            order_number: Order number (e.g., #W001)
+
+        Returns:
+            Order object or None if not found
+        """
+        return self._orders_by_key.get((email.lower(), order_number.lower()))
 
     def get_product_by_sku(self, sku: str) -> Optional[Product]:
         """Get product information by SKU."""
-        for product_data in self.product_catalog:
-            if product_data["SKU"] == sku:
-                return Product(
-                    product_name=product_data["ProductName"],
-                    sku=product_data["SKU"],
-                    inventory=product_data["Inventory"],
-                    description=product_data["Description"],
-                    tags=product_data.get("Tags", [])
-                )
-        return None
+        return self._products_by_sku.get(sku)
 
     def search_products(self, query: str, category: Optional[str] = None) -> List[Product]:
         """
@@ -123,49 +188,36 @@ class DataProvider:
             List of matching Product objects
         """
 
-        query_lower = query.lower()
-        query_words = query_lower.split()
+        query_words = query.lower().translate(_QUERY_PUNCTUATION).split()
+        word_matchers = [_word_matcher(word) for word in query_words]
+        category_lower = category.lower() if category else None
         scored_results = []
 
-        for product_data in self.product_catalog:
+        for entry in self._catalog_entries:
             # Skip if category filter doesn't match
-            if category and category.lower() not in [tag.lower() for tag in product_data.get("Tags", [])]:
+            if category_lower and category_lower not in entry.tag_set:
                 continue
 
-            # Search in name, description, and tags with scoring
-            product_name = product_data.get("ProductName", "").lower()
-            description = product_data.get("Description", "").lower()
-            tags = " ".join(product_data.get("Tags", [])).lower()
-
             score = 0
             matches_found = 0
 
-            for word in query_words:
-                word_pattern = r"\b" + re.escape(word) + r"\b"
-
+            for matches in word_matchers:
                 # Higher score for name matches (most relevant)
-                if re.search(word_pattern, product_name):
+                if matches(entry.name_words, entry.name):
                     score += 10
                     matches_found += 1
                 # Medium score for tag matches
-                elif re.search(word_pattern, tags):
+                elif matches(entry.tag_words, entry.tags):
                     score += 5
                     matches_found += 1
                 # Lower score for description matches
-                elif re.search(word_pattern, description):
+                elif matches(entry.description_words, entry.description):
                     score += 2
                     matches_found += 1
 
             # Only include if at least one word matches
             if matches_found > 0:
-                product = Product(
-                    product_name=product_data["ProductName"],
-                    sku=product_data["SKU"],
-                    inventory=product_data["Inventory"],
-                    description=product_data["Description"],
-                    tags=product_data.get("Tags", [])
-                )
-                scored_results.append((score, product))
+                scored_results.append((score, entry.product))
 
         # Sort by score (descending) and extract products
         scored_results.sort(key=lambda x: x[0], reverse=True)
@@ -174,22 +226,8 @@ class DataProvider:
 
     def get_products_by_category(self, category: str) -> List[Product]:
         """Get all products in a specific category."""
-
-        results = []
-        category_lower = category.lower()
-
-        for product_data in self.product_catalog:
-            if any(tag.lower() == category_lower for tag in product_data.get("Tags", [])):
-                product = Product(
-                    product_name=product_data["ProductName"],
-                    sku=product_data["SKU"],
-                    inventory=product_data["Inventory"],
-                    description=product_data["Description"],
-                    tags=product_data.get("Tags", [])
-                )
-                results.append(product)
-
-        return results
+        # Copied so callers can extend the result without touching the index
+        return list(self._products_by_tag.get(category.lower(), ()))
 
     def is_early_risers_time(self) -> bool:
         """
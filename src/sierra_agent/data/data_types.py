@@ -6,11 +6,12 @@ Basic business data types only - no planning types to avoid circular imports.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
+from sierra_agent.utils.compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class Product:
     """Product information matching the JSON structure."""
     product_name: str
@@ -29,7 +30,7 @@ class Product:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Order:
     """Order information matching the JSON structure."""
     customer_name: str
@@ -56,7 +57,7 @@ class Order:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Promotion:
     """Promotion information."""
     name: str
@@ -78,13 +79,45 @@ class Promotion:
 # Business data types for tools
 BusinessData = Union[Order, Product, List[Product], Promotion, Dict[str, Any]]
 
+# Data kinds by exact type; lists are classified by their first item
+_DATA_KINDS: Dict[type, str] = {
+    Order: "order",
+    Product: "product",
+    Promotion: "promotion",
+    dict: "dict",
+}
+
+
+def _classify_data(data: Any) -> str:
+    """Get the kind of a tool result's data, as reported by ToolResult.data_kind."""
+    if data is None:
+        return "none"
+    kind = _DATA_KINDS.get(type(data))
+    if kind:
+        return kind
+    if isinstance(data, list):
+        return "product_list" if data and isinstance(data[0], Product) else "list"
+    return "other"
+
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ToolResult:
     """Strongly typed container for tool execution results."""
     data: Optional[BusinessData] = None
     success: bool = True
     error: Optional[str] = None
+    # serialize_for_context() output, filled on first use
+    _context_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # data_kind, filled on first use
+    _kind_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def data_kind(self) -> str:
+        """Kind of data carried: "order", "product", "product_list", "promotion",
+        "dict", "list", "none" or "other"."""
+        if self._kind_cache is None:
+            self._kind_cache = _classify_data(self.data)
+        return self._kind_cache
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert ToolResult to dictionary format."""
@@ -117,24 +150,19 @@ class ToolResult:
         }
 
     def serialize_for_context(self) -> str:
-        """Format result data for LLM context."""
+        """Format result data for LLM context, formatting each result only once."""
+        if self._context_cache is None:
+            self._context_cache = self._format_for_context()
+        return self._context_cache
+
+    def _format_for_context(self) -> str:
         if not self.success:
             return f"Error: {self.error or 'Unknown error'}"
         if not self.data:
             return "No data available"
             
-        if isinstance(self.data, Order):
-            return self._format_order(self.data)
-        elif isinstance(self.data, list) and self.data and isinstance(self.data[0], Product):
-            return self._format_product_list(self.data)
-        elif isinstance(self.data, Product):
-            return self._format_product(self.data)
-        elif isinstance(self.data, Promotion):
-            return self._format_promotion(self.data)
-        elif isinstance(self.data, dict):
-            return self._format_dict(self.data)
-        else:
-            return str(self.data)[:500]
+        format_data = _CONTEXT_FORMATTERS.get(self.data_kind)
+        return format_data(self, self.data) if format_data else str(self.data)[:500]
     
     def _format_order(self, order: Order) -> str:
         products = "\n".join(f"    - {sku}" for sku in order.products_ordered)
@@ -189,4 +217,14 @@ Valid: {promotion.valid_hours}"""
             display_key = key.replace("_", " ").title()
             formatted_items.append(f"{display_key}: {value}")
         
-        return "\n".join(formatted_items)
\ No newline at end of file
+        return "\n".join(formatted_items)
+
+
+# Context formatters per data kind; other kinds are shown truncated as text
+_CONTEXT_FORMATTERS: Dict[str, Callable[[ToolResult, Any], str]] = {
+    "order": ToolResult._format_order,
+    "product_list": ToolResult._format_product_list,
+    "product": ToolResult._format_product,
+    "promotion": ToolResult._format_promotion,
+    "dict": ToolResult._format_dict,
+}
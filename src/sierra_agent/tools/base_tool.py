@@ -5,13 +5,21 @@ Provides the foundation for all business tools to ensure consistent behavior
 and easy extensibility for new tool types.
 """
 
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Type, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Type, Union
 
 from sierra_agent.data.data_types import ToolResult
 
 
+@lru_cache(maxsize=None)  # Tools rebuild their parameters on every access
+def _compile_pattern(pattern: str) -> Pattern[str]:
+    """Compile a validation rule pattern once per distinct pattern."""
+    return re.compile(pattern)
+
+
 @dataclass
 class ToolParameter:
     """Defines a tool parameter with validation rules."""
@@ -99,9 +107,8 @@ class BaseTool(ABC):
                 return f"Parameter {param.name} must be at most {max_value}"
         
         if 'pattern' in rules and isinstance(value, str):
-            import re
             pattern = rules['pattern']
-            if isinstance(pattern, str) and not re.match(pattern, value):
+            if isinstance(pattern, str) and not _compile_pattern(pattern).match(value):
                 return f"Parameter {param.name} format is invalid"
         
         return None
@@ -149,15 +156,19 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
+        # Bumped on every change so callers can cache derived tool listings
+        self.version = 0
     
     def register(self, tool: BaseTool) -> None:
         """Register a new tool."""
         self._tools[tool.tool_name] = tool
+        self.version += 1
     
     def unregister(self, tool_name: str) -> None:
         """Remove a tool from the registry."""
         if tool_name in self._tools:
             del self._tools[tool_name]
+            self.version += 1
     
     def get_tool(self, tool_name: str) -> Optional[BaseTool]:
         """Get a tool by name."""
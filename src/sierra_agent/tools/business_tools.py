@@ -91,7 +91,6 @@ class BusinessTools:
 
             return ToolResult(success=True, data=result, error=None)
             
-        from datetime import timezone
         pacific_tz = timezone(timedelta(hours=-8))
         current_time = datetime.now(pacific_tz)
         current_time_str = current_time.strftime("%I:%M %p")
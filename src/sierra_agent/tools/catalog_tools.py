@@ -5,12 +5,63 @@ These tools are specifically designed to work with the Sierra Outfitters product
 and provide intelligent recommendations based on the actual inventory.
 """
 
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, Set, Tuple
 from sierra_agent.data.data_provider import DataProvider
 from sierra_agent.data.data_types import ToolResult
 from sierra_agent.utils.branding import Branding
 from .base_tool import BaseTool, ToolParameter
 
+# Smart complementary relationships based on actual catalog
+_COMPLEMENT_RULES: Dict[str, Tuple[str, ...]] = {
+    # Outdoor/Adventure complements
+    "adventure": ("high-tech", "food & beverage", "safety-enhanced"),
+    "hiking": ("adventure-ready", "food & beverage"),
+    "backpack": ("adventure", "food & beverage", "high-tech"),
+
+    # Tech complements
+    "high-tech": ("adventure", "safety-enhanced", "personal flight"),
+    "personal flight": ("high-tech", "safety-enhanced"),
+
+    # Lifestyle complements
+    "fashion": ("luxury", "modern design"),
+    "luxury": ("modern design", "interior style"),
+    "home decor": ("luxury", "lighting", "modern design"),
+
+    # Food complements
+    "food & beverage": ("adventure-ready", "versatile"),
+}
+
+# Activities mapped to relevant categories, matched as substrings
+_ACTIVITY_TAGS: Dict[str, Tuple[str, ...]] = {
+    "hiking": ("hiking", "backpack", "adventure"),
+    "camping": ("adventure", "outdoor gear", "food & beverage"),
+    "outdoor": ("adventure", "outdoor gear", "hiking"),
+    "tech": ("high-tech", "personal flight", "advanced cloaking"),
+    "technology": ("high-tech", "personal flight", "advanced cloaking"),
+    "gadgets": ("high-tech", "personal flight"),
+    "fashion": ("fashion", "lifestyle"),
+    "style": ("fashion", "lifestyle", "luxury"),
+    "home": ("home decor", "lighting", "luxury"),
+    "interior": ("home decor", "interior style", "modern design"),
+    "food": ("food & beverage", "adventure-ready"),
+    "travel": ("adventure", "personal flight", "teleportation"),
+    "adventure": ("adventure", "adventure-ready", "explorer"),
+}
+
+# One scan finds every activity keyword: longer keywords are tried first, and
+# a match also counts the keywords it contains ("technology" -> "tech"), so the
+# result equals testing each keyword as a substring
+_ACTIVITY_KEYWORDS = re.compile(
+    "|".join(re.escape(k) for k in sorted(_ACTIVITY_TAGS, key=len, reverse=True))
+)
+_ACTIVITY_KEYWORDS_WITHIN = {
+    keyword: frozenset(k for k in _ACTIVITY_TAGS if k in keyword) for keyword in _ACTIVITY_TAGS
+}
+
+# Categories general recommendations are drawn from, in order
+_FEATURED_CATEGORIES = ("Adventure", "High-Tech", "Backpack", "Food & Beverage", "Fashion")
+
 
 class ProductCatalogTool(BaseTool):
     """Browse and search the complete Sierra Outfitters product catalog."""
@@ -66,8 +117,9 @@ class ProductCatalogTool(BaseTool):
             products = self.data_provider.search_products(search_query)
             if category_filter:
                 # Further filter by category
-                products = [p for p in products 
-                          if category_filter.lower() in [tag.lower() for tag in p.tags]]
+                category_lower = category_filter.lower()
+                products = [p for p in products
+                          if any(tag.lower() == category_lower for tag in p.tags)]
         elif category_filter:
             # Filter by category only
             products = self.data_provider.get_products_by_category(category_filter)
@@ -76,9 +128,11 @@ class ProductCatalogTool(BaseTool):
             products = self.data_provider.search_products("Adventure")
             if len(products) < limit:
                 additional = self.data_provider.search_products("High-Tech")
+                seen_skus = {p.sku for p in products}
                 for product in additional:
-                    if product.sku not in [p.sku for p in products]:
+                    if product.sku not in seen_skus:
                         products.append(product)
+                        seen_skus.add(product.sku)
         
         if not products:
             return ToolResult(
@@ -244,26 +298,6 @@ class SmartRecommendationTool(BaseTool):
         if not reference_skus:
             return self._get_general_recommendations(limit)
         
-        # Define smart complementary relationships based on actual catalog
-        complement_rules = {
-            # Outdoor/Adventure complements
-            "adventure": ["high-tech", "food & beverage", "safety-enhanced"],
-            "hiking": ["adventure-ready", "food & beverage"],
-            "backpack": ["adventure", "food & beverage", "high-tech"],
-            
-            # Tech complements  
-            "high-tech": ["adventure", "safety-enhanced", "personal flight"],
-            "personal flight": ["high-tech", "safety-enhanced"],
-            
-            # Lifestyle complements
-            "fashion": ["luxury", "modern design"],
-            "luxury": ["modern design", "interior style"],
-            "home decor": ["luxury", "lighting", "modern design"],
-            
-            # Food complements
-            "food & beverage": ["adventure-ready", "versatile"],
-        }
-        
         # Get reference products and their tags
         reference_products = []
         for sku in reference_skus:
@@ -282,8 +316,8 @@ class SmartRecommendationTool(BaseTool):
         for ref_product in reference_products:
             for tag in ref_product.tags:
                 tag_lower = tag.lower()
-                if tag_lower in complement_rules:
-                    for comp_tag in complement_rules[tag_lower]:
+                if tag_lower in _COMPLEMENT_RULES:
+                    for comp_tag in _COMPLEMENT_RULES[tag_lower]:
                         comp_products = self.data_provider.get_products_by_category(comp_tag)
                         for product in comp_products:
                             if product.sku not in used_skus and len(complementary_products) < limit:
@@ -300,28 +334,14 @@ class SmartRecommendationTool(BaseTool):
         
         activity_lower = activity.lower()
         
-        # Map activities to relevant categories
-        activity_map = {
-            "hiking": ["hiking", "backpack", "adventure"],
-            "camping": ["adventure", "outdoor gear", "food & beverage"],
-            "outdoor": ["adventure", "outdoor gear", "hiking"],
-            "tech": ["high-tech", "personal flight", "advanced cloaking"],
-            "technology": ["high-tech", "personal flight", "advanced cloaking"],
-            "gadgets": ["high-tech", "personal flight"],
-            "fashion": ["fashion", "lifestyle"],
-            "style": ["fashion", "lifestyle", "luxury"],
-            "home": ["home decor", "lighting", "luxury"],
-            "interior": ["home decor", "interior style", "modern design"],
-            "food": ["food & beverage", "adventure-ready"],
-            "travel": ["adventure", "personal flight", "teleportation"],
-            "adventure": ["adventure", "adventure-ready", "explorer"],
-        }
-        
-        # Find matching categories
-        relevant_tags = []
-        for keyword, tags in activity_map.items():
-            if keyword in activity_lower:
-                relevant_tags.extend(tags)
+        # Find matching categories, in table order
+        matched: Set[str] = set()
+        for match in _ACTIVITY_KEYWORDS.finditer(activity_lower):
+            matched |= _ACTIVITY_KEYWORDS_WITHIN[match.group()]
+        # Categories shared by several keywords are looked up once
+        relevant_tags = list(dict.fromkeys(
+            tag for keyword, tags in _ACTIVITY_TAGS.items() if keyword in matched for tag in tags
+        ))
         
         if not relevant_tags:
             # Fallback: search by activity term directly
@@ -343,11 +363,10 @@ class SmartRecommendationTool(BaseTool):
     def _get_general_recommendations(self, limit: int) -> List:
         """Get general popular recommendations."""
         # Focus on diverse, interesting products from catalog
-        featured_categories = ["Adventure", "High-Tech", "Backpack", "Food & Beverage", "Fashion"]
         recommendations: List[Any] = []
         used_skus = set()
         
-        for category in featured_categories:
+        for category in _FEATURED_CATEGORIES:
             products = self.data_provider.get_products_by_category(category)
             for product in products:
                 if product.sku not in used_skus and len(recommendations) < limit:
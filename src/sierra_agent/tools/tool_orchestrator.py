@@ -6,7 +6,8 @@ using the BaseTool interface. Makes adding new tools extremely easy.
 """
 
 import logging
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from sierra_agent.data.data_provider import DataProvider
 from sierra_agent.data.data_types import ToolResult
@@ -18,6 +19,14 @@ from .business_tools import BusinessTools  # Keep for legacy support
 
 logger = logging.getLogger(__name__)
 
+# Planning descriptions for the legacy business tools
+_LEGACY_TOOL_INFO = MappingProxyType({
+    "get_early_risers_promotion": "Check Early Risers promotion availability (8-10 AM PT)",
+    "get_company_info": "Get Sierra Outfitters company information and values",
+    # "get_contact_info": "Get contact details and social media information",  # COMMENTED OUT
+    # "get_policies": "Get return, shipping, and warranty policy information"  # COMMENTED OUT
+})
+
 
 class ToolOrchestrator:
     """Extensible tool orchestrator with automatic tool discovery and registration."""
@@ -32,6 +41,11 @@ class ToolOrchestrator:
         
         # Initialize tool registry
         self.tool_registry = ToolRegistry()
+        # Sorted tool names and their set, with the registry version they were
+        # built from
+        self._available_tools_cache: Optional[Tuple[int, List[str], FrozenSet[str]]] = None
+        # Planning prompt tool descriptions, keyed the same way
+        self._planning_description_cache: Optional[Tuple[int, str]] = None
         
         # Keep legacy business tools for backward compatibility
         self.business_tools = BusinessTools()
@@ -40,7 +54,7 @@ class ToolOrchestrator:
         # Auto-register all available tools
         self._register_all_tools()
         
-        logger.info(f"ToolOrchestrator initialized with {len(self.tool_registry.list_tools())} tools")
+        logger.info("ToolOrchestrator initialized with %s tools", len(self.tool_registry.list_tools()))
 
     def _get_legacy_tools(self) -> Dict[str, Any]:
         """Get legacy tools for backward compatibility."""
@@ -65,18 +79,18 @@ class ToolOrchestrator:
         
         for tool in tools_to_register:
             self.tool_registry.register(tool)
-            logger.debug(f"Registered tool: {tool.tool_name}")
+            logger.debug("Registered tool: %s", tool.tool_name)
 
     def register_tool(self, tool: BaseTool) -> None:
         """Register a new tool dynamically."""
         self.tool_registry.register(tool)
-        logger.info(f"Dynamically registered tool: {tool.tool_name}")
+        logger.info("Dynamically registered tool: %s", tool.tool_name)
 
     def execute_tool(self, tool_name: str, **kwargs) -> ToolResult:
         """Execute a tool by name with automatic fallback to legacy tools."""
         
         # First try new extensible tools
-        if tool_name in self.tool_registry.list_tools():
+        if self.tool_registry.get_tool(tool_name) is not None:
             return self.tool_registry.execute_tool(tool_name, **kwargs)
         
         # Fallback to legacy tools for backward compatibility
@@ -85,7 +99,7 @@ class ToolOrchestrator:
                 legacy_tool = self.legacy_tools[tool_name]
                 return legacy_tool(**kwargs)
             except Exception as e:
-                logger.exception(f"Error executing legacy tool {tool_name}: {e}")
+                logger.exception("Error executing legacy tool %s: %s", tool_name, e)
                 return ToolResult(
                     success=False,
                     error=f"Legacy tool execution failed: {str(e)}",
@@ -102,9 +116,20 @@ class ToolOrchestrator:
 
     def get_available_tools(self) -> List[str]:
         """Get list of all available tools (new + legacy)."""
-        new_tools = self.tool_registry.list_tools()
-        legacy_tools = list(self.legacy_tools.keys())
-        return sorted(new_tools + legacy_tools)
+        return list(self._get_available_tools_cache()[1])
+
+    def get_available_tool_set(self) -> FrozenSet[str]:
+        """Get the names of all available tools, for membership checks."""
+        return self._get_available_tools_cache()[2]
+
+    def _get_available_tools_cache(self) -> Tuple[int, List[str], FrozenSet[str]]:
+        # Legacy tools are fixed at init, so only registry changes invalidate
+        version = self.tool_registry.version
+        cached = self._available_tools_cache
+        if cached is None or cached[0] != version:
+            names = sorted(self.tool_registry.list_tools() + list(self.legacy_tools.keys()))
+            cached = self._available_tools_cache = (version, names, frozenset(names))
+        return cached
 
     def get_tool_schema(self, tool_name: str) -> Dict[str, Any]:
         """Get schema for a specific tool."""
@@ -134,21 +159,23 @@ class ToolOrchestrator:
     
     def get_tools_for_llm_planning(self) -> str:
         """Get formatted tool descriptions for LLM planning prompts."""
+        # Cached like the tool list: only registry changes alter the text
+        version = self.tool_registry.version
+        cached = self._planning_description_cache
+        if cached is None or cached[0] != version:
+            cached = self._planning_description_cache = (version, self._build_tools_for_llm_planning())
+        return cached[1]
+
+    def _build_tools_for_llm_planning(self) -> str:
+        """Format tool descriptions for LLM planning prompts."""
         # Get extensible tool descriptions (with automatic parameter info)
         extensible_descriptions = self.tool_registry.get_tools_for_llm_planning()
         
         # Add legacy tool descriptions
-        legacy_descriptions = []
-        legacy_tool_info = {
-            "get_early_risers_promotion": "Check Early Risers promotion availability (8-10 AM PT)",
-            "get_company_info": "Get Sierra Outfitters company information and values",
-            # "get_contact_info": "Get contact details and social media information",  # COMMENTED OUT
-            # "get_policies": "Get return, shipping, and warranty policy information"  # COMMENTED OUT
-        }
-        
-        for tool_name in self.legacy_tools:
-            description = legacy_tool_info.get(tool_name, "Legacy business tool")
-            legacy_descriptions.append(f"- {tool_name}: {description}")
+        legacy_descriptions = [
+            f"- {tool_name}: {_LEGACY_TOOL_INFO.get(tool_name, 'Legacy business tool')}"
+            for tool_name in self.legacy_tools
+        ]
         
         # Combine all descriptions
         all_descriptions = []
@@ -6,6 +6,7 @@ and messaging templates for consistent customer interactions with adventure pers
 """
 
 import random
+import re
 from typing import List
 
 
@@ -30,6 +31,12 @@ class Branding:
     # Mountain Emojis for Various Uses
     MOUNTAIN_EMOJIS = ["🏔️", "⛰️", "🗻", "🏕️", "🥾", "🧗", "🎒"]
 
+    # Emojis and catchphrase openings, each found in one scan of a response
+    _MOUNTAIN_EMOJI_PATTERN = re.compile("|".join(map(re.escape, MOUNTAIN_EMOJIS)))
+    _CATCHPHRASE_PATTERN = re.compile(
+        "|".join(re.escape(phrase.split("!")[0]) for phrase in ADVENTURE_CATCHPHRASES)
+    )
+
     # Brand Voice Guidelines - Adventure Personality (Balanced)
     BRAND_GUIDANCE = """
     Sierra Outfitters Brand Voice - Outdoor Adventure Spirit:
@@ -153,11 +160,11 @@ class Branding:
         catchphrase = random.choice(cls.ADVENTURE_CATCHPHRASES)
         
         # Add mountain emoji to start if not already present
-        if not any(e in base_response for e in cls.MOUNTAIN_EMOJIS):
+        if not cls._MOUNTAIN_EMOJI_PATTERN.search(base_response):
             base_response = f"{emoji} {base_response}"
         
         # Add catchphrase if response doesn't already end with one
-        if not any(phrase.split('!')[0] in base_response for phrase in cls.ADVENTURE_CATCHPHRASES):
+        if not cls._CATCHPHRASE_PATTERN.search(base_response):
             base_response = f"{base_response}\n\n{catchphrase}"
             
         return base_response
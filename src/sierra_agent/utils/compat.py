@@ -0,0 +1,13 @@
+"""
+Python Version Compatibility Helpers
+
+Feature switches for language features that are not available on every
+supported Python version.
+"""
+
+import sys
+from typing import Any, Dict
+
+# Keyword arguments that add __slots__ to a dataclass where supported (3.10+).
+# Usage: @dataclass(**DATACLASS_SLOTS)
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -0,0 +1,57 @@
+"""
+JSON Encoding Helpers
+
+Compact JSON encoding that uses orjson when it is installed (the ``fast``
+extra) and falls back to the standard library otherwise. Objects with a
+``to_dict`` method, datetimes, enums and non-list sequences are encoded
+through a shared ``default`` hook, so callers can pass model objects
+straight to the encoder instead of building a dict tree first.
+"""
+
+import json
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the JSON encoders do not handle natively."""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (deque, set, frozenset, tuple)):
+        return list(obj)
+    msg = f"Object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON bytes."""
+    if _HAS_ORJSON:
+        # Dataclasses go through to_dict so both encoders emit the same fields
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from str or bytes."""
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Agent Test Suite
+
+Tests covering how streamed replies are recorded in the conversation.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from sierra_agent.ai.llm_service import INTERRUPTED_REPLY_NOTICE
+from sierra_agent.core.agent import SierraAgent
+
+
+def _agent_replying_with(chunks):
+    """Build an agent whose planning service streams the given chunks."""
+    agent = SierraAgent()
+    agent.start_conversation()
+
+    def process_user_input(session_id, user_input, tool_orchestrator, stream=False):
+        def reply():
+            for chunk in chunks:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        return agent.planning_service.get_or_create_plan(session_id, user_input), reply()
+
+    agent.planning_service.process_user_input = process_user_input
+    return agent
+
+
+def _last_ai_message(agent):
+    return agent.conversation.get_ai_messages()[-1].content
+
+
+def test_stream_records_complete_reply():
+    """Test that the recorded reply is exactly the streamed text."""
+    agent = _agent_replying_with(["Your order ", "has shipped."])
+
+    assert agent.process_user_input("where is my order?") == "Your order has shipped."
+    assert _last_ai_message(agent) == "Your order has shipped."
+
+
+def test_stream_failure_after_output_marks_reply_as_cut_off():
+    """Test that a mid-stream failure keeps the partial reply instead of apologizing over it."""
+    agent = _agent_replying_with(["Your order ", RuntimeError("connection reset")])
+
+    response = agent.process_user_input("where is my order?")
+    assert response == "Your order " + INTERRUPTED_REPLY_NOTICE
+    assert _last_ai_message(agent) == response
+
+
+def test_stream_failure_before_output_falls_back():
+    """Test that a failure before any output yields only the fallback."""
+    agent = _agent_replying_with([RuntimeError("connection reset")])
+
+    response = agent.process_user_input("where is my order?")
+    assert "technical difficulties" in response
+    assert _last_ai_message(agent) == response
+
+
+def test_stream_closed_early_records_what_was_sent():
+    """Test that a caller that stops reading still leaves the sent text recorded."""
+    agent = _agent_replying_with(["Your order ", "has shipped."])
+
+    stream = agent.process_user_input_stream("where is my order?")
+    assert next(stream) == "Your order "
+    stream.close()
+    assert _last_ai_message(agent) == "Your order "
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Conversation Test Suite
+
+Tests covering message history bookkeeping in the Conversation class.
+"""
+
+import io
+import json
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from sierra_agent.core.conversation import Conversation, MessageType, classify_messages
+from sierra_agent.data.data_types import Order, Product, Promotion, ToolResult
+
+
+def test_message_type_filters():
+    """Test that per-type getters return messages in order."""
+    conversation = Conversation()
+    conversation.add_system_message("Session started")
+    conversation.add_user_message("hello")
+    conversation.add_ai_message("Hi there!")
+    conversation.add_user_message("track my order")
+
+    assert [m.content for m in conversation.get_user_messages()] == ["hello", "track my order"]
+    assert [m.content for m in conversation.get_ai_messages()] == ["Hi there!"]
+    assert [m.message_type for m in conversation.get_system_messages()] == [MessageType.SYSTEM.value]
+
+
+def test_recent_messages_with_tool_results():
+    """Test that only AI messages carrying tool results are returned, oldest first."""
+    conversation = Conversation()
+    for i in range(3):
+        conversation.add_user_message(f"question {i}")
+        conversation.add_ai_message_with_results(f"answer {i}", [ToolResult(data=None, success=True)])
+    conversation.add_ai_message("no results here")
+
+    recent = conversation.get_recent_messages_with_tool_results(limit=2)
+    assert [m.content for m in recent] == ["answer 1", "answer 2"]
+
+    conversation.clear_conversation()
+    assert conversation.get_recent_messages_with_tool_results() == []
+
+
+def test_conversation_patterns_counts():
+    """Test that pattern counts track adds and reset on clear."""
+    conversation = Conversation()
+    conversation.add_system_message("Session started")
+    conversation.add_user_message("hello")
+    conversation.add_ai_message("Hi there!")
+    conversation.add_user_message("thanks")
+
+    patterns = conversation.get_conversation_patterns()
+    assert patterns["user_messages"] == 2
+    assert patterns["ai_messages"] == 1
+    assert patterns["system_messages"] == 1
+
+    conversation.clear_conversation()
+    assert conversation.get_conversation_patterns()["user_messages"] == 0
+
+
+def test_conversation_state_keyword_detection():
+    """Test topic priority and urgency detection from user messages."""
+    conversation = Conversation()
+    conversation.add_user_message("I need new hiking boots")
+    assert conversation.conversation_state.current_topic == "product_inquiry"
+    assert conversation.conversation_state.urgency_level == "normal"
+
+    # Order keywords win over product keywords, and plurals still match
+    conversation.add_user_message("Where are my ORDERS of boots? This is URGENT")
+    assert conversation.conversation_state.current_topic == "order_management"
+    assert conversation.conversation_state.urgency_level == "high"
+
+
+def test_previous_tool_results_by_type():
+    """Test that previous tool results are looked up by data type, newest first."""
+    conversation = Conversation()
+    first = ToolResult(data=Promotion(name="Early Risers", description="", discount_percentage=10, valid_hours="", discount_code=""))
+    second = ToolResult(data=Promotion(name="Late Owls", description="", discount_percentage=5, valid_hours="", discount_code=""))
+    failed = ToolResult(data=None, success=False, error="lookup failed")
+    conversation.add_ai_message_with_results("first", [first])
+    conversation.add_ai_message_with_results("second", [second, failed])
+
+    assert conversation.get_previous_tool_results(Promotion) == [second, first]
+    assert conversation.get_previous_tool_results(Promotion, limit=1) == [second]
+    assert conversation.get_previous_tool_results(Order) == []
+
+
+def test_build_conversational_context():
+    """Test that context joins previous and current results and is empty without data."""
+    conversation = Conversation()
+    assert conversation.build_conversational_context() == ""
+
+    conversation.add_ai_message_with_results("Here is your order", [ToolResult(data=None, success=False, error="not found")])
+    context = conversation.build_conversational_context([ToolResult(data=None, success=False, error="timeout")])
+    previous, current = context.split("\n\n")
+    assert previous.startswith("Previous response: Here is your order")
+    assert "not found" in previous
+    assert current.startswith("Current results:")
+    assert "timeout" in current
+
+
+def test_export_conversation():
+    """Test that the export contains every message as a plain dictionary."""
+    conversation = Conversation()
+    conversation.add_user_message("hello")
+    conversation.add_ai_message_with_results("Hi!", [ToolResult(data=None, success=False, error="none")])
+
+    conversation.get_message_history()[0].ensure_metadata()["channel"] = "chat"
+
+    exported = conversation.export_conversation()
+    assert [m["message_type"] for m in exported["messages"]] == ["user", "ai"]
+    assert [m["metadata"] for m in exported["messages"]] == [{"channel": "chat"}, {}]
+    assert exported["messages"][1]["tool_results"] == [{"success": False, "error": "none", "data": None}]
+    assert exported["conversation_state"]["conversation_phase"] == "greeting"
+
+
+def test_bounded_history_eviction():
+    """Test that old messages are evicted and bookkeeping follows them."""
+    conversation = Conversation(max_history=4)
+    conversation.add_ai_message_with_results("old answer", [ToolResult(data=None, success=True)])
+    for i in range(3):
+        conversation.add_user_message(f"question {i}")
+    conversation.add_ai_message_with_results("new answer", [ToolResult(data=None, success=True)])
+
+    assert [m.content for m in conversation.get_message_history()] == [
+        "question 0", "question 1", "question 2", "new answer",
+    ]
+    assert [m.content for m in conversation.get_message_history(limit=2)] == ["question 2", "new answer"]
+    assert [m.content for m in conversation.get_recent_messages_with_tool_results()] == ["new answer"]
+    assert conversation.get_conversation_patterns()["ai_messages"] == 1
+    assert conversation.get_conversation_patterns()["user_messages"] == 3
+
+
+def test_clear_conversation_resets_state_in_place():
+    """Test that clearing resets context and state without replacing them."""
+    conversation = Conversation()
+    state = conversation.conversation_state
+    conversation.add_user_message("my order is broken")
+    conversation.customer_context.update_sentiment("negative")
+    exported = conversation.export_conversation()
+
+    conversation.clear_conversation()
+    assert conversation.conversation_state is state
+    assert state.current_topic == "general"
+    assert state.urgency_level == "normal"
+    assert not conversation.customer_context.sentiment_history
+    assert exported["customer_context"]["sentiment_history"] == ["negative"]
+
+
+def test_conversation_phase_thresholds():
+    """Test phase transitions at the message-count boundaries."""
+    conversation = Conversation()
+    phases = []
+    for i in range(6):
+        conversation.add_user_message(f"question {i}")
+        conversation.add_ai_message(f"answer {i}")
+        phases.append(conversation.conversation_state.conversation_phase)
+
+    assert phases == ["greeting", "exploration", "exploration", "resolution", "resolution", "closing"]
+
+
+def test_customer_history_is_bounded():
+    """Test that sentiment history keeps only the most recent entries."""
+    conversation = Conversation()
+    for i in range(100):
+        conversation.customer_context.update_sentiment(f"s{i}")
+
+    assert len(conversation.customer_context.sentiment_history) == 64
+    assert conversation.get_customer_sentiment_trend(limit=2) == ["s98", "s99"]
+
+
+def test_json_export_matches_streamed_export():
+    """Test that the streamed JSON writer produces the same document as the bulk export."""
+    conversation = Conversation()
+    conversation.add_user_message("héllo")
+    conversation.add_ai_message_with_results("Hi!", [ToolResult(data={"available": True}, success=True)])
+
+    buffer = io.BytesIO()
+    conversation.write_conversation_json(buffer)
+    streamed = json.loads(buffer.getvalue())
+    exported = json.loads(conversation.export_conversation_json())
+
+    streamed.pop("duration_seconds")
+    exported.pop("duration_seconds")
+    assert streamed == exported
+    assert [m["content"] for m in exported["messages"]] == ["héllo", "Hi!"]
+
+
+def test_long_history_is_summarized():
+    """Test that the oldest messages fold into a summary past the token budget."""
+    conversation = Conversation(context_window_tokens=100)
+    for i in range(8):
+        conversation.add_user_message(f"message {i} " + "x" * 40)
+
+    history = conversation.get_message_history()
+    assert history[0].message_type == MessageType.SYSTEM.value
+    assert history[0].content.startswith("Summary of")
+    assert history[-1].content.startswith("message 7")
+    assert len(history) < 8
+    assert conversation.get_conversation_patterns()["system_messages"] == 1
+
+
+def test_message_reuse_recycles_evicted_messages():
+    """Test that pooled conversations recycle evicted messages with fresh fields."""
+    conversation = Conversation(max_history=2, reuse_messages=True)
+    conversation.add_user_message("first")
+    first = conversation.get_message_history()[0]
+    conversation.add_ai_message_with_results("second", [ToolResult(data=None, success=True)])
+    conversation.add_user_message("third")  # Evicts "first"
+    conversation.add_system_message("fourth")  # Evicts "second", reuses "first"
+
+    history = conversation.get_message_history()
+    assert [m.content for m in history] == ["third", "fourth"]
+    assert history[1] is first
+    assert history[1].message_type == MessageType.SYSTEM.value
+    assert history[1].tool_results is None
+    assert conversation.get_recent_messages_with_tool_results() == []
+
+
+def test_classify_messages_codes():
+    """Test topic and urgency codes from the pure classifier."""
+    assert classify_messages([
+        "hello there",
+        "my TENT arrived broken",
+        "return the boots, where is my order?",
+    ]) == [(0, 0), (2, 1), (1, 0)]
+
+
+def test_available_data_tracks_latest_results():
+    """Test that the latest order and product list are available without rescanning."""
+    conversation = Conversation()
+    assert conversation.get_available_data() == {}
+
+    product = Product(product_name="Trail Boots", sku="SOBT003", inventory=5, description="", tags=[])
+    conversation.add_ai_message_with_results("Found boots", [ToolResult(data=[product])])
+    conversation.add_ai_message_with_results("Lookup failed", [ToolResult(data=None, success=False, error="x")])
+
+    assert conversation.get_available_data() == {"recent_products": [product]}
+    conversation.clear_conversation()
+    assert conversation.get_available_data() == {}
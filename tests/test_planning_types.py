@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Planning Types Test Suite
+
+Tests covering the rule-based shortcuts of EvolvingPlan.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from sierra_agent.core.planning_types import EvolvingPlan
+from sierra_agent.data.data_types import Order
+
+
+def test_direct_action_for_clear_requests():
+    """Test that unmistakable order status and promotion requests skip the LLM."""
+    plan = EvolvingPlan(plan_id="plan_test", original_request="")
+
+    for request in [
+        "Where is my order?",
+        "track my order",
+        "What's the status of order #W002?",
+        "john.doe@example.com",
+        "#W001",
+    ]:
+        assert plan.determine_direct_action(request) == "get_order_status", request
+    assert plan.determine_direct_action("Is the Early Risers deal on?") == "get_early_risers_promotion"
+
+
+def test_direct_action_ignores_keyword_false_positives():
+    """Test that order and recommendation keywords alone leave planning to the LLM."""
+    plan = EvolvingPlan(plan_id="plan_test", original_request="")
+
+    for request in [
+        "I want to order a new tent",
+        "How do I cancel my order?",
+        "I need a return label for my order",
+        "thanks for tracking that down",
+        "Can you recommend a tent?",
+        "Where is my order #W001 and any early risers deal?",
+    ]:
+        assert plan.determine_direct_action(request) is None, request
+
+
+def test_direct_action_defers_once_an_order_is_loaded():
+    """Test that order requests about a loaded order are left to the LLM."""
+    plan = EvolvingPlan(plan_id="plan_test", original_request="")
+    plan.context.current_order = Order(
+        customer_name="John Doe", email="john.doe@example.com", order_number="#W001",
+        products_ordered=["SOBP001"], status="delivered",
+    )
+
+    assert plan.determine_direct_action("where is my order?") is None
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Semantic Cache Test Suite
+
+Tests covering exact and similarity lookups, context partitioning and eviction.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from sierra_agent.ai.llm_client import LLMClient
+from sierra_agent.ai.llm_service import LLMService
+from sierra_agent.ai.prompt_types import Prompt
+from sierra_agent.ai.semantic_cache import SemanticCache
+
+# Toy embeddings: paraphrases of the same request point the same way
+EMBEDDINGS = {
+    "check my order": [1.0, 0.1, 0.0],
+    "what's up with my order": [0.9, 0.12, 0.0],
+    "recommend some gear": [0.0, 0.2, 1.0],
+    "hi, i'm sarah": [0.1, 1.0, 0.0],
+    "hi, i'm sara": [0.1, 0.98, 0.0],
+    "hey, i'm sarah": [0.1, 0.99, 0.0],
+}
+
+
+def embed(text):
+    if text not in EMBEDDINGS:
+        raise ValueError(text)
+    return EMBEDDINGS[text]
+
+
+def test_paraphrase_reuses_cached_value():
+    """Test that a similar request in the same context skips the computation."""
+    cache = SemanticCache(embed)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["get_order_status"]
+
+    assert cache.get_or_compute("check my order", "ctx", compute) == ["get_order_status"]
+    assert cache.get_or_compute("what's up with my order", "ctx", compute) == ["get_order_status"]
+    assert len(calls) == 1
+    assert cache.get_statistics() == {"entries": 1, "hits": 1, "exact_hits": 0, "misses": 1}
+
+
+def test_exact_repeat_skips_embedding():
+    """Test that an exact repeat is answered without embedding until it goes stale."""
+    embedded = []
+
+    def counting_embed(text):
+        embedded.append(text)
+        return embed(text)
+
+    cache = SemanticCache(counting_embed)
+    cache.get_or_compute("check my order", "ctx", lambda: ["get_order_status"])
+    assert cache.get_or_compute("  Check my ORDER ", "ctx", lambda: ["recomputed"]) == ["get_order_status"]
+    assert embedded == ["check my order"]
+    assert cache.get_statistics()["exact_hits"] == 1
+
+    cache.exact_ttl = 0
+    assert cache.get_or_compute("check my order", "ctx", lambda: ["recomputed"]) == ["get_order_status"]
+    assert embedded == ["check my order", "check my order"]
+
+
+def test_context_and_dissimilar_requests_miss():
+    """Test that other contexts and unrelated requests compute their own values."""
+    cache = SemanticCache(embed)
+    cache.get_or_compute("check my order", "ctx", lambda: ["get_order_status"])
+
+    assert cache.get_or_compute("check my order", "other", lambda: ["wait_for_missing_info"]) == ["wait_for_missing_info"]
+    assert cache.get_or_compute("recommend some gear", "ctx", lambda: ["get_recommendations"]) == ["get_recommendations"]
+    assert len(cache) == 3
+
+
+def test_failures_are_not_cached():
+    """Test that empty results and embedding failures bypass the cache."""
+    cache = SemanticCache(embed)
+    assert cache.get_or_compute("check my order", "ctx", list) == []
+    assert cache.get_or_compute("unknown text", "ctx", lambda: ["browse_catalog"]) == ["browse_catalog"]
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that a full cache drops the entry used longest ago."""
+    cache = SemanticCache(embed, max_entries=1)
+    cache.get_or_compute("check my order", "ctx", lambda: ["get_order_status"])
+    cache.get_or_compute("recommend some gear", "ctx", lambda: ["get_recommendations"])
+
+    assert cache.get_or_compute("check my order", "ctx", lambda: ["recomputed"]) == ["recomputed"]
+
+
+def test_entries_persist_across_instances(tmp_path):
+    """Test that a cache backed by SQLite reloads its entries and keeps its bound."""
+    db_path = str(tmp_path / "cache.sqlite3")
+    cache = SemanticCache(embed, max_entries=2, db_path=db_path)
+    cache.get_or_compute("check my order", "ctx", lambda: ["get_order_status"])
+    cache.get_or_compute("recommend some gear", "ctx", lambda: ["get_recommendations"])
+    cache.close()
+
+    reopened = SemanticCache(embed, max_entries=1, db_path=db_path)
+    assert len(reopened) == 1
+    assert reopened.get_or_compute("recommend some gear", "ctx", lambda: ["recomputed"]) == ["get_recommendations"]
+    reopened.clear()
+    reopened.close()
+    assert len(SemanticCache(embed, db_path=db_path)) == 0
+
+
+def test_exact_only_lookups_ignore_similar_requests():
+    """Test that exact-only lookups never reuse a value across different requests."""
+    cache = SemanticCache(embed)
+
+    assert cache.get_or_compute("hi, i'm sarah", "ctx", lambda: "Welcome Sarah!", match_similar=False) == "Welcome Sarah!"
+    assert cache.get_or_compute("hi, i'm sara", "ctx", lambda: "Welcome Sara!", match_similar=False) == "Welcome Sara!"
+    # Values stored for exact lookups are invisible to similarity lookups
+    assert cache.get_or_compute("hey, i'm sarah", "ctx", lambda: "Hello there!") == "Hello there!"
+    assert cache.get_or_compute("Hi, I'm Sarah", "ctx", lambda: "recomputed", match_similar=False) == "Welcome Sarah!"
+    assert cache.get_statistics()["exact_hits"] == 1
+
+
+def test_reply_to_name_bearing_greeting_is_not_reused(monkeypatch):
+    """Test that a reply echoing one customer's name is not served to another."""
+    # The greetings embed close enough to count as paraphrases
+    monkeypatch.setattr(LLMClient, "embed", lambda self, text: embed(text.lower()))
+    service = LLMService()
+    replies = iter(["Welcome Sarah!", "Welcome Sara!"])
+    service.low_latency_client.call_llm = lambda prompt: next(replies)
+    prompt = Prompt(system_prompt="Greet the customer.", user_message="")
+
+    assert service.generate_cached_reply(prompt, "Hi, I'm Sarah") == "Welcome Sarah!"
+    assert service.generate_cached_reply(prompt, "Hi, I'm Sara") == "Welcome Sara!"
+    assert service.generate_cached_reply(prompt, "Hi, I'm Sarah") == "Welcome Sarah!"